@@ -0,0 +1,230 @@
+"""Benchmark Red Moon's ingest and render path with synthetic or replayed traffic.
+
+Runs the real monitor window against a synthetic:// or replay:// source (or any Redis URL)
+and reports sustained throughput, GUI-thread latency, message age on arrival in the UI and
+memory growth. With --startup it instead times cold starts of main.py. Thresholds turn it
+into a regression check: the exit status is 1 when one is missed.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+LAG_PROBE_INTERVAL = 10  # Milliseconds between GUI-thread latency probes
+STARTUP_RUNS = 5  # Cold starts timed by --startup
+
+
+def percentile(values: list[float], quantile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(quantile * len(ordered)), len(ordered) - 1)]
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # Peak rather than current RSS, which is the best available outside Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def source_url(args) -> str:
+    if args.url:
+        return args.url
+    if args.replay:
+        return f"replay://{os.path.abspath(args.replay)}?speed={args.speed}&loop=1"
+    return (
+        f"synthetic://?rate={args.rate}&channels={args.channels}"
+        f"&size={args.payload_size}&seed={args.seed}"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=float, default=20_000, help="Messages/s, 0 for unpaced")
+    parser.add_argument("--channels", type=int, default=1000, help="Distinct channels")
+    parser.add_argument("--payload-size", type=int, default=128, help="Payload bytes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", help="Replay this NDJSON recording instead")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed, 0 for unpaced")
+    parser.add_argument("--url", help="Any subscriber URL, e.g. a real Redis server")
+    parser.add_argument("--pattern", default="*")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds before measuring")
+    parser.add_argument("--open-windows", type=int, default=0, help="Output windows to open")
+    parser.add_argument("--fps", type=int, help="Frame rate of the render scheduler")
+    parser.add_argument("--no-throttle", action="store_true", help="Render every batch")
+    parser.add_argument("--disk-history", action="store_true", help="Log messages to disk")
+    parser.add_argument("--show", action="store_true", help="Show the window on screen")
+    parser.add_argument("--instrument", action="store_true", help="Report per-stage timings")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--min-throughput", type=float, help="Fail below this many msg/s")
+    parser.add_argument("--max-lag-ms", type=float, help="Fail above this p99 GUI lag")
+    parser.add_argument("--startup", action="store_true", help="Time cold starts instead")
+    parser.add_argument("--max-startup-ms", type=float, help="Fail above this median start")
+    return parser.parse_args(argv)
+
+
+def run(args) -> dict:
+    if not args.show:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QEventLoop, Qt, QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    from core.instrumentation import instruments
+    from gui import RedisMonitor
+
+    app = QApplication(sys.argv[:1])
+    monitor = RedisMonitor()
+    monitor.show()
+
+    def spin(seconds: float):
+        loop = QEventLoop()
+        QTimer.singleShot(int(seconds * 1000), Qt.TimerType.PreciseTimer, loop.quit)
+        loop.exec_()
+
+    # GUI-thread latency: how late a short repeating timer fires
+    lags: list[float] = []
+    last_tick = time.monotonic()
+
+    def probe():
+        nonlocal last_tick
+        now = time.monotonic()
+        lags.append(max(now - last_tick - LAG_PROBE_INTERVAL / 1000, 0.0))
+        last_tick = now
+
+    probe_timer = QTimer()
+    probe_timer.timeout.connect(probe)
+    probe_timer.start(LAG_PROBE_INTERVAL)
+
+    # Age of the oldest message in each batch when the GUI thread applies it
+    ages: list[float] = []
+    add_channels = monitor.channel_manager.add_channels
+
+    def timed_add_channels(messages):
+        if messages:
+            ages.append(time.time() - messages[0][2])
+        add_channels(messages)
+
+    monitor.channel_manager.add_channels = timed_add_channels
+
+    if args.fps:
+        monitor.render_scheduler.set_fps(args.fps)
+    if args.no_throttle:
+        monitor.render_scheduler.set_enabled(False)
+    if args.disk_history:
+        monitor.toggle_disk_history()
+    monitor.ui_setup.redis_url_input.setText(source_url(args))
+    monitor.ui_setup.channel_pattern_input.setText(args.pattern)
+    monitor.toggle_monitoring()
+    spin(args.warmup)
+
+    channel_model = monitor.channel_model
+    for row in range(min(args.open_windows, channel_model.rowCount())):
+        channel_name = channel_model.channel_name(channel_model.index(row, 0))
+        monitor.window_manager.open_output_window(channel_name)
+
+    def delivered() -> int:
+        return sum(buffer.total for buffer in monitor.message_store.buffers.values())
+
+    lags.clear()
+    ages.clear()
+    instruments.clear()
+    instruments.enabled = args.instrument
+    start_delivered = delivered()
+    start_dropped = monitor.ingest_queue.dropped_total
+    start_rss = rss_bytes()
+    started = time.monotonic()
+    spin(args.duration)
+    elapsed = time.monotonic() - started
+    end_delivered = delivered()
+    end_dropped = monitor.ingest_queue.dropped_total
+    end_rss = rss_bytes()
+    backlog = len(monitor.ingest_queue)
+    instruments.enabled = False
+    stages = instruments.snapshot()["stages"]
+
+    probe_timer.stop()
+    monitor.toggle_monitoring()
+    monitor.close()
+    app.processEvents()
+
+    results = {
+        "source": source_url(args),
+        "seconds": round(elapsed, 3),
+        "channels": channel_model.rowCount(),
+        "delivered_per_second": round((end_delivered - start_delivered) / elapsed, 1),
+        "dropped_per_second": round((end_dropped - start_dropped) / elapsed, 1),
+        "backlog": backlog,
+        "gui_lag_p50_ms": round(percentile(lags, 0.5) * 1000, 2),
+        "gui_lag_p99_ms": round(percentile(lags, 0.99) * 1000, 2),
+        "gui_lag_max_ms": round(max(lags, default=0.0) * 1000, 2),
+        "message_age_p50_ms": round(percentile(ages, 0.5) * 1000, 2),
+        "message_age_p99_ms": round(percentile(ages, 0.99) * 1000, 2),
+        "rss_start_mb": round(start_rss / 2**20, 1),
+        "rss_growth_mb": round((end_rss - start_rss) / 2**20, 1),
+    }
+    for stage, stats in stages.items():
+        results[f"{stage}_calls"] = stats["calls"]
+        results[f"{stage}_p99_ms"] = round((stats["p99"] or 0.0) * 1000, 3)
+    return results
+
+
+def measure_startup(args) -> dict:
+    """Wall-clock time of fresh ``main.py`` processes until their event loop runs."""
+    env = dict(os.environ)
+    if not args.show:
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    times = []
+    for _ in range(STARTUP_RUNS):
+        started = time.monotonic()
+        subprocess.run(
+            [sys.executable, main_path, "--startup-time"],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        times.append(time.monotonic() - started)
+    return {
+        "startup_runs": len(times),
+        "startup_p50_ms": round(percentile(times, 0.5) * 1000, 1),
+        "startup_max_ms": round(max(times) * 1000, 1),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = measure_startup(args) if args.startup else run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            print(f"{name:>22}: {value}")
+
+    failures = []
+    if args.startup:
+        if args.max_startup_ms is not None and results["startup_p50_ms"] > args.max_startup_ms:
+            failures.append(f"startup {results['startup_p50_ms']} ms > {args.max_startup_ms} ms")
+    else:
+        throughput = results["delivered_per_second"]
+        if args.min_throughput is not None and throughput < args.min_throughput:
+            failures.append(f"throughput {throughput} < {args.min_throughput}")
+        if args.max_lag_ms is not None and results["gui_lag_p99_ms"] > args.max_lag_ms:
+            failures.append(f"p99 GUI lag {results['gui_lag_p99_ms']} ms > {args.max_lag_ms} ms")
+    for failure in failures:
+        print(f"FAILED: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Headless Red Moon: stream pub/sub messages to stdout or a file without loading Qt."""
+
+import argparse
+import sys
+import time
+from typing import BinaryIO, Callable, TextIO
+
+from core import FilterEngine, Message, create_subscriber
+from core.export import format_ndjson
+from core.filters import DROP, EXCLUDE, INCLUDE, KEEP, parse_rules
+
+
+def format_tsv(channel: str, payload: bytes, timestamp: float) -> bytes:
+    escaped = payload.replace(b"\\", b"\\\\").replace(b"\n", b"\\n").replace(b"\t", b"\\t")
+    return channel.encode("utf-8") + b"\t" + escaped + b"\n"
+
+
+FORMATTERS: dict[str, Callable[[str, bytes, float], bytes]] = {
+    "tsv": format_tsv,
+    "jsonl": format_ndjson,
+}
+
+
+class RateSummary:
+    """Prints the busiest channels with their message and byte rates every interval."""
+
+    def __init__(self, interval: float, stream: TextIO, top: int = 10):
+        self.interval = interval
+        self.stream = stream
+        self.top = top
+        self.started = time.monotonic()
+        self.counts: dict[str, int] = {}
+        self.nbytes: dict[str, int] = {}
+
+    def add(self, batch: list[Message]):
+        counts = self.counts
+        nbytes = self.nbytes
+        for channel, payload, _ in batch:
+            counts[channel] = counts.get(channel, 0) + 1
+            nbytes[channel] = nbytes.get(channel, 0) + len(payload)
+        if self.interval and time.monotonic() - self.started >= self.interval:
+            self.report()
+
+    def report(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        total = sum(self.counts.values())
+        print(
+            f"--- {total} messages on {len(self.counts)} channels, "
+            f"{total / elapsed:.1f} msg/s over {elapsed:.1f}s",
+            file=self.stream,
+        )
+        busiest = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        for channel, count in busiest[: self.top]:
+            print(
+                f"{count / elapsed:10.1f} msg/s {self.nbytes[channel] / elapsed:12.1f} B/s  "
+                f"{channel}",
+                file=self.stream,
+            )
+        self.stream.flush()
+        self.started = time.monotonic()
+        self.counts.clear()
+        self.nbytes.clear()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", action="append", help="Redis URL, repeat for several servers")
+    parser.add_argument(
+        "--pattern", action="append", help="Channel pattern for PSUBSCRIBE, repeatable"
+    )
+    for action, help_text in [
+        (INCLUDE, "Only show channels matching this glob (or re:<regex>), repeatable"),
+        (EXCLUDE, "Hide channels matching this glob (or re:<regex>), repeatable"),
+        (KEEP, "Only show payloads containing this (or re:, json:<path>[=<value>])"),
+        (DROP, "Hide payloads containing this (or re:, json:<path>[=<value>])"),
+    ]:
+        parser.add_argument(f"--{action}", action="append", default=[], help=help_text)
+    parser.add_argument("--filter-file", help="File of filter rules, one per line")
+    parser.add_argument("--format", choices=sorted(FORMATTERS), default="tsv")
+    parser.add_argument("--output", help="File to append messages to (default: stdout)")
+    parser.add_argument(
+        "--summary-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between per-channel rate summaries on stderr, 0 to disable",
+    )
+    return parser.parse_args(argv)
+
+
+def filter_rules(args) -> list[tuple[str, str]]:
+    lines = []
+    if args.filter_file:
+        with open(args.filter_file, encoding="utf-8") as rules_file:
+            lines = rules_file.read().splitlines()
+    for action in (INCLUDE, EXCLUDE, KEEP, DROP):
+        lines += [f"{action} {expression}" for expression in getattr(args, action)]
+    return parse_rules("\n".join(lines))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        filter_engine = FilterEngine(filter_rules(args))
+    except (OSError, ValueError) as error:
+        sys.exit(f"Invalid filters: {error}")
+    try:
+        subscriber = create_subscriber(
+            args.url or ["redis://localhost:6379"],
+            args.pattern or ["*"],
+            on_status=lambda status: print(status, file=sys.stderr),
+        )
+    except ValueError as error:
+        sys.exit(f"Invalid source: {error}")
+    formatter = FORMATTERS[args.format]
+    output: BinaryIO = open(args.output, "ab") if args.output else sys.stdout.buffer
+    summary = RateSummary(args.summary_interval, sys.stderr)
+
+    def write_batch(batch: list[Message]):
+        batch = filter_engine.apply(batch)
+        if not batch:
+            return
+        output.write(b"".join(formatter(*message) for message in batch))
+        output.flush()
+        summary.add(batch)
+
+    try:
+        subscriber.run(write_batch)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.summary_interval:
+            summary.report()
+        if output is not sys.stdout.buffer:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
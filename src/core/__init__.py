@@ -0,0 +1,31 @@
+from typing import TYPE_CHECKING
+
+__all__ = [
+    "ChannelMetrics",
+    "FilterEngine",
+    "IngestQueue",
+    "Message",
+    "MessageBuffer",
+    "MessageStore",
+    "Subscriber",
+    "create_subscriber",
+    "split_list",
+]
+
+from .filters import FilterEngine
+from .ingest_queue import IngestQueue
+from .metrics import ChannelMetrics
+from .message_store import MessageBuffer, MessageStore
+from .messages import Message, split_list
+
+# The subscribers bring in redis, so they are imported on first use rather than at startup
+if TYPE_CHECKING:
+    from .subscriber import Subscriber, create_subscriber
+
+
+def __getattr__(name: str):
+    if name in ("Subscriber", "create_subscriber"):
+        from . import subscriber
+
+        return getattr(subscriber, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Optional
+
+import redis.asyncio as aioredis
+from redis.exceptions import (
+    ConnectionError as RedisConnectionError,
+    RedisError,
+    TimeoutError as RedisTimeoutError,
+)
+
+from .connection import (
+    CONNECTION_OPTIONS,
+    Backoff,
+    StatusCallback,
+    StatusReporter,
+    check_url,
+)
+from .decoding import ChannelNames
+from .messages import BATCH_INTERVAL, BATCH_SIZE, Message
+
+
+LISTEN_TIMEOUT = 1.0  # Seconds per message read, given so socket_timeout does not apply
+
+
+class AsyncSubscriber:
+    """Subscribes to several patterns on several Redis servers from one asyncio loop.
+
+    Every connection feeds the same pending list, which is handed on as one merged stream
+    of time- and size-bounded batches, like ``Subscriber``. Each server reconnects with its
+    own backoff on its own connection pool. A server that refuses the subscription is
+    reported and dropped; the stream ends once every server has been dropped.
+    """
+
+    def __init__(
+        self,
+        redis_urls: list[str],
+        channel_patterns: list[str],
+        batch_interval: float = BATCH_INTERVAL,
+        batch_size: int = BATCH_SIZE,
+        on_status: Optional[StatusCallback] = None,
+    ):
+        for redis_url in redis_urls:
+            check_url(redis_url)
+        self.redis_urls = redis_urls
+        self.channel_patterns = channel_patterns
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self.status = StatusReporter(on_status)
+        self.channel_names = ChannelNames()
+
+        self._pending: list[Message] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop_requested = False
+        self._ready: asyncio.Event
+        self._full: asyncio.Event
+
+    def run(self, on_batch: Callable[[list[Message]], None]):
+        try:
+            asyncio.run(self._run(on_batch))
+        except asyncio.CancelledError:
+            pass
+
+    def stop(self):
+        """Cancel the running loop's work from any thread; listeners unsubscribe on the way out."""
+        self._stop_requested = True
+        loop, task = self._loop, self._task
+        if loop is None or task is None:
+            return
+        try:
+            loop.call_soon_threadsafe(task.cancel)
+        except RuntimeError:
+            pass  # The loop has already finished
+
+    async def _run(self, on_batch: Callable[[list[Message]], None]):
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        if self._stop_requested:
+            return
+        async for batch in self.batches():
+            on_batch(batch)
+
+    async def batches(self) -> AsyncIterator[list[Message]]:
+        self._pending = []
+        self._ready = asyncio.Event()
+        self._full = asyncio.Event()
+        listeners = [asyncio.create_task(self._listen(url)) for url in self.redis_urls]
+        try:
+            while True:
+                await self._ready.wait()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.batch_interval)
+                except asyncio.TimeoutError:
+                    pass
+                pending, self._pending = self._pending, []
+                self._ready.clear()
+                self._full.clear()
+                for start in range(0, len(pending), self.batch_size):
+                    yield pending[start : start + self.batch_size]
+                if all(listener.done() for listener in listeners):
+                    return
+        finally:
+            for listener in listeners:
+                listener.cancel()
+            await asyncio.gather(*listeners, return_exceptions=True)
+
+    async def _listen(self, redis_url: str):
+        backoff = Backoff()
+        # asyncio pools are bound to their event loop, so every run owns and closes its pools
+        pool = aioredis.ConnectionPool.from_url(redis_url, **CONNECTION_OPTIONS)
+        client = aioredis.Redis(connection_pool=pool)
+        try:
+            while True:
+                pubsub = client.pubsub()
+                try:
+                    await pubsub.psubscribe(*self.channel_patterns)
+                    if backoff.attempts:
+                        backoff.reset()
+                        self.status.report(f"Monitoring {redis_url}")
+                    while True:
+                        message = await pubsub.get_message(timeout=LISTEN_TIMEOUT)
+                        if message is None or message["type"] != "pmessage":
+                            continue
+                        channel = self.channel_names(message["channel"])
+                        self._pending.append((channel, message["data"], time.time()))
+                        if len(self._pending) == 1:
+                            self._ready.set()
+                        elif len(self._pending) >= self.batch_size:
+                            self._full.set()
+                except (RedisTimeoutError, RedisConnectionError, OSError):
+                    self.status.report(f"Wait For Connection to {redis_url} ...")
+                    await asyncio.sleep(backoff.next_delay())
+                except RedisError as error:
+                    # Refused outright, e.g. NOPERM under an ACL; retrying would not help
+                    self.status.report(f"Subscription to {redis_url} failed: {error}")
+                    return
+                finally:
+                    await self._close(pubsub)
+        finally:
+            await client.aclose()
+            await pool.disconnect()
+            self._ready.set()  # Let batches notice once every listener has ended
+
+    async def _close(self, pubsub):
+        try:
+            if pubsub.subscribed:
+                await pubsub.punsubscribe()
+        except (RedisError, OSError):
+            pass
+        await pubsub.aclose()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+# redis is imported by the first pool or URL check, keeping it out of startup
+if TYPE_CHECKING:
+    import redis
+
+
+StatusCallback = Callable[[str], None]
+
+
+# Applied to every pool so dead peers are noticed instead of hanging a subscriber forever
+CONNECTION_OPTIONS = {
+    "socket_keepalive": True,
+    "socket_connect_timeout": 5,
+    # Bounds replies such as psubscribe or CONFIG GET; waits for messages pass their own timeout
+    "socket_timeout": 10,
+    "health_check_interval": 30,
+}
+
+
+_pools: dict[str, redis.ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def check_url(redis_url: str):
+    """Raise ValueError for a URL redis-py cannot connect with, e.g. one without a scheme."""
+    from redis.connection import parse_url
+
+    parse_url(redis_url)
+
+
+def get_pool(redis_url: str) -> redis.ConnectionPool:
+    """Connection pool for a URL, shared across subscribers and monitoring restarts."""
+    import redis
+
+    with _pools_lock:
+        pool = _pools.get(redis_url)
+        if pool is None:
+            pool = _pools[redis_url] = redis.ConnectionPool.from_url(
+                redis_url, **CONNECTION_OPTIONS
+            )
+        return pool
+
+
+class Backoff:
+    """Exponential reconnect delay with jitter, reset after a successful connection."""
+
+    def __init__(self, initial: float = 0.5, maximum: float = 30.0, factor: float = 2.0):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.attempts = 0
+
+    def next_delay(self) -> float:
+        delay = min(self.initial * self.factor**self.attempts, self.maximum)
+        self.attempts += 1
+        # Equal jitter: never less than half the delay, so retries still back off
+        return random.uniform(delay / 2, delay)
+
+    def reset(self):
+        self.attempts = 0
+
+
+class StatusReporter:
+    """Forwards status text to a callback, repeating the same text at most once per
+    ``min_interval`` seconds.
+    """
+
+    def __init__(self, callback: Optional[StatusCallback], min_interval: float = 5.0):
+        self.callback = callback
+        self.min_interval = min_interval
+        self._last_reported: dict[str, float] = {}
+
+    def report(self, status: str):
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        if now - self._last_reported.get(status, -self.min_interval) < self.min_interval:
+            return
+        self._last_reported[status] = now
+        self.callback(status)
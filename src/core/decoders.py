@@ -0,0 +1,274 @@
+"""Pluggable payload decoders and a thread pool that runs them off the GUI thread.
+
+A decoder turns a raw payload into display text, raising ``ValueError`` when the payload
+is not in its format. Text, JSON and hexdump rendering come from ``core.decoding``, so
+previews and decoders share one text path. ``register_decoder`` adds more; msgpack is
+offered when the optional ``msgpack`` package is installed.
+"""
+
+from __future__ import annotations
+
+import base64
+import importlib.util
+import json
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, Optional
+
+from .decoding import decode_text, hexdump, preview_text, render_json, render_text
+from .instrumentation import DECODE, instruments
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_WORKERS = 2  # Decoding threads shared by every output window
+CACHE_ENTRIES = 4096  # Decoded texts kept, previews and full renderings alike
+CACHE_CHARS = 32_000_000  # Total characters kept before the oldest texts are evicted
+MAX_PENDING = 256  # Queued previews; beyond this, they are retried on the next paint
+MAX_RENDER_CHARS = 1_000_000  # Longer renderings are cut so the text view stays responsive
+MAX_DECOMPRESSED_BYTES = 64 * 1024 * 1024  # Guards against decompression bombs
+TEXT_SNIFF_BYTES = 64  # Leading bytes checked to tell text from binary payloads
+GZIP_MAGIC = b"\x1f\x8b"
+
+AUTO = "auto"
+TEXT = "text"
+JSON = "json"
+MSGPACK = "msgpack"
+BASE64 = "base64"
+HEXDUMP = "hexdump"
+GZIP = "gzip"
+
+
+class Decoder:
+    __slots__ = ("name", "label", "render")
+
+    def __init__(self, name: str, label: str, render: Callable[[bytes], str]):
+        self.name = name
+        self.label = label
+        self.render = render
+
+
+DECODERS: dict[str, Decoder] = {}
+
+
+def register_decoder(name: str, label: str, render: Callable[[bytes], str]):
+    DECODERS[name] = Decoder(name, label, render)
+
+
+def msgpack_available() -> bool:
+    return importlib.util.find_spec("msgpack") is not None
+
+
+def looks_like_text(payload: bytes) -> bool:
+    """Whether the payload starts like UTF-8 text rather than a compressed or binary format."""
+    if payload.startswith(GZIP_MAGIC):
+        return False
+    head = payload[:TEXT_SNIFF_BYTES]
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as error:
+        # A multi-byte character cut off by the sniffing window is still text
+        return len(head) == TEXT_SNIFF_BYTES and error.start >= TEXT_SNIFF_BYTES - 3
+    return True
+
+
+def decompress_gzip(payload: bytes) -> bytes:
+    try:
+        decompressor = zlib.decompressobj(wbits=31)
+        data = decompressor.decompress(payload, MAX_DECOMPRESSED_BYTES)
+    except zlib.error as error:
+        raise ValueError(f"not gzip data ({error})") from None
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"decompresses to more than {MAX_DECOMPRESSED_BYTES} bytes")
+    return data
+
+
+def render_msgpack(payload: bytes) -> str:
+    import msgpack
+
+    try:
+        value = msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    except (msgpack.UnpackException, TypeError) as error:
+        raise ValueError(str(error)) from None
+    return json.dumps(value, indent=2, ensure_ascii=False, default=repr)
+
+
+def render_base64(payload: bytes) -> str:
+    return render_auto(base64.b64decode(b"".join(payload.split()), validate=True))
+
+
+def render_gzip(payload: bytes) -> str:
+    return render_auto(decompress_gzip(payload))
+
+
+def render_auto(payload: bytes) -> str:
+    """Gzip is unpacked and msgpack recognised when installed; otherwise like render_text."""
+    if payload.startswith(GZIP_MAGIC):
+        try:
+            return render_gzip(payload)
+        except ValueError:
+            pass
+    elif not looks_like_text(payload) and msgpack_available():
+        try:
+            return render_msgpack(payload)
+        except ValueError:
+            pass
+    return render_text(payload)
+
+
+register_decoder(AUTO, "Auto", render_auto)
+register_decoder(TEXT, "Text", decode_text)
+register_decoder(JSON, "JSON", render_json)
+if msgpack_available():
+    register_decoder(MSGPACK, "MessagePack", render_msgpack)
+register_decoder(BASE64, "Base64", render_base64)
+register_decoder(HEXDUMP, "Hexdump", hexdump)
+register_decoder(GZIP, "Gzip", render_gzip)
+
+
+def decode(payload: bytes, decoder_name: str) -> str:
+    """Display text of ``payload``; a payload the decoder rejects is shown as a hexdump."""
+    decoder = DECODERS[decoder_name]
+    try:
+        text = decoder.render(payload)
+    except ValueError as error:
+        text = f"Not {decoder.label}: {error}\n\n{hexdump(payload[:4096])}"
+    if len(text) > MAX_RENDER_CHARS:
+        text = text[:MAX_RENDER_CHARS] + f"\n... {len(text) - MAX_RENDER_CHARS} more characters"
+    return text
+
+
+def decodes_inline(decoder_name: str, payload: bytes) -> bool:
+    """Whether a one-line preview is just the raw text, cheap enough for the calling thread."""
+    return decoder_name == TEXT or (decoder_name == AUTO and looks_like_text(payload))
+
+
+def preview(text: str, limit: int) -> str:
+    """One line of decoded text, whitespace runs collapsed, at most ``limit`` characters."""
+    return " ".join(text[: limit * 4].split())[:limit]
+
+
+class DecodePool:
+    """Runs decoders on worker threads and keeps their output in an LRU cache.
+
+    Callers key each result, e.g. by channel, sequence number and decoder, so a message is
+    decoded at most once while its text is cached. ``request`` never blocks: it returns
+    the cached text, or ``None`` after queueing the work, and ``on_done(key)`` is then
+    called from a worker thread. ``clear`` also discards decodes still in flight, for when
+    keys are reused, e.g. after the channels are cleared.
+
+    Previews are bounded by ``MAX_PENDING`` and re-requested when painted again. Full
+    decodes are never dropped and run on a worker of their own, so the message a user
+    selected is not queued behind a screenful of previews.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        max_entries: int = CACHE_ENTRIES,
+        max_chars: int = CACHE_CHARS,
+    ):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="decode")
+        self._detail_executor = ThreadPoolExecutor(1, thread_name_prefix="decode-detail")
+        self._cache: OrderedDict[Hashable, str] = OrderedDict()
+        self._chars = 0
+        self._pending: set[Hashable] = set()
+        self._pending_previews = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def cached(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+            return text
+
+    def request(
+        self,
+        key: Hashable,
+        payload: bytes,
+        decoder_name: str,
+        on_done: Callable[[Hashable], None],
+        preview_limit: Optional[int] = None,
+    ) -> Optional[str]:
+        """Decoded text of ``payload`` if cached; otherwise queue it and return ``None``.
+
+        With ``preview_limit`` the result is a one-line preview of that many characters.
+        """
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+                return text
+            if key in self._pending:
+                return None
+            if preview_limit is not None and self._pending_previews >= MAX_PENDING:
+                return None
+            self._pending.add(key)
+            if preview_limit is not None:
+                self._pending_previews += 1
+            generation = self._generation
+        executor = self._executor if preview_limit is not None else self._detail_executor
+        executor.submit(
+            self._decode, key, payload, decoder_name, on_done, preview_limit, generation
+        )
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._chars = 0
+            self._pending.clear()
+            self._pending_previews = 0
+            self._generation += 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._detail_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _decode(
+        self,
+        key: Hashable,
+        payload: bytes,
+        decoder_name: str,
+        on_done: Callable[[Hashable], None],
+        preview_limit: Optional[int],
+        generation: int,
+    ):
+        started = instruments.start()
+        try:
+            if preview_limit is not None and decodes_inline(decoder_name, payload):
+                text = preview_text(payload, preview_limit)
+            else:
+                text = decode(payload, decoder_name)
+                if preview_limit is not None:
+                    text = preview(text, preview_limit)
+        except Exception as error:  # A plug-in decoder failing must not kill the worker
+            text = f"Decoder {decoder_name} failed: {error!r}"
+        instruments.stop(DECODE, started)
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._pending.discard(key)
+            if preview_limit is not None:
+                self._pending_previews -= 1
+            self._store(key, text)
+        try:
+            on_done(key)
+        except Exception:
+            logger.exception("Delivering decoded text for %r failed", key)
+
+    def _store(self, key: Hashable, text: str):
+        cache = self._cache
+        cache[key] = text
+        self._chars += len(text)
+        while cache and (len(cache) > self.max_entries or self._chars > self.max_chars):
+            _, evicted = cache.popitem(last=False)
+            self._chars -= len(evicted)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import sys
+
+
+MAX_CHANNEL_NAMES = 1_000_000  # Distinct raw channel names remembered by ChannelNames
+HEXDUMP_WIDTH = 16
+
+
+class ChannelNames:
+    """Decodes each distinct raw channel name once and hands out the same interned str.
+
+    Invalid UTF-8 is kept visible as backslash escapes, so binary channel names never raise
+    on the subscriber thread.
+    """
+
+    def __init__(self, limit: int = MAX_CHANNEL_NAMES):
+        self.limit = limit
+        self._names: dict[bytes, str] = {}
+
+    def __call__(self, raw: bytes) -> str:
+        name = self._names.get(raw)
+        if name is None:
+            name = sys.intern(raw.decode("utf-8", errors="backslashreplace"))
+            if len(self._names) < self.limit:
+                self._names[raw] = name
+        return name
+
+
+def decode_text(data: bytes | str) -> str:
+    """Text of a payload or server reply field; invalid UTF-8 stays visible as escapes."""
+    return data.decode("utf-8", errors="backslashreplace") if isinstance(data, bytes) else data
+
+
+def preview_text(payload: bytes, limit: int) -> str:
+    """One-line preview of at most ``limit`` payload bytes."""
+    return decode_text(payload[:limit]).replace("\r", " ").replace("\n", " ")
+
+
+def hexdump(payload: bytes) -> str:
+    lines = []
+    for offset in range(0, len(payload), HEXDUMP_WIDTH):
+        chunk = payload[offset : offset + HEXDUMP_WIDTH]
+        hex_part = " ".join(f"{byte:02x}" for byte in chunk)
+        text_part = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in chunk)
+        lines.append(f"{offset:08x}  {hex_part:<{HEXDUMP_WIDTH * 3}} {text_part}")
+    return "\n".join(lines)
+
+
+def render_json(payload: bytes | str) -> str:
+    """Pretty-printed JSON; raises ValueError for anything else."""
+    return json.dumps(json.loads(payload), indent=2, ensure_ascii=False)
+
+
+def render_text(payload: bytes) -> str:
+    """Full display text: pretty-printed JSON, plain UTF-8, or a hexdump for binary data."""
+    try:
+        text = payload.decode("utf-8")
+    except UnicodeDecodeError:
+        return hexdump(payload)
+
+    if text.lstrip()[:1] in ("{", "["):
+        try:
+            return render_json(text)
+        except ValueError:
+            pass
+    return text
@@ -0,0 +1,158 @@
+"""The redis-backed sources of ``core.events``, imported by ``create_event_subscriber``."""
+
+from __future__ import annotations
+
+import threading
+import time
+from fnmatch import fnmatchcase
+from typing import Callable, Iterator, Optional
+
+import redis
+from redis.exceptions import (
+    ConnectionError as RedisConnectionError,
+    RedisError,
+    TimeoutError as RedisTimeoutError,
+)
+
+from .connection import Backoff, StatusCallback, StatusReporter, get_pool
+from .decoding import ChannelNames
+from .events import (
+    DEFAULT_SAMPLE_RATE,
+    KEYSPACE_EVENT_CLASSES,
+    parse_monitor_line,
+    quoted_argument,
+)
+from .messages import BATCH_INTERVAL, BATCH_SIZE, Message
+from .subscriber import Subscriber
+
+
+class KeyspaceSubscriber(Subscriber):
+    """Keyspace notifications for keys matching ``key_pattern``.
+
+    Each event becomes a ``keyspace:<event>`` message whose payload is the key. The
+    server only sends them with ``notify-keyspace-events`` set; if it is not, the status
+    callback says so rather than the subscriber changing server configuration.
+    """
+
+    sample_rate = 1
+
+    def __init__(self, redis_url: str, key_pattern: str = "*", **kwargs):
+        super().__init__(redis_url, f"__keyspace@*__:{key_pattern}", **kwargs)
+
+    def batches(self) -> Iterator[list[Message]]:
+        self._check_config()
+        yield from super().batches()
+
+    def _message(self, channel: bytes, data: bytes) -> Message:
+        key = channel[channel.find(b"__:") + 3 :]
+        return self.channel_names(b"keyspace:" + data), key, time.time()
+
+    def _check_config(self):
+        try:
+            config = redis.Redis(connection_pool=self.pool).config_get("notify-keyspace-events")
+        except RedisError:
+            return  # Unreachable for now, or CONFIG is disabled; nothing to check
+        flags = next(iter(config.values()), b"")
+        flags = flags.decode() if isinstance(flags, bytes) else flags
+        if "K" not in flags or not set(flags) & set(KEYSPACE_EVENT_CLASSES):
+            self.status.report(
+                "Keyspace notifications are off: enable them with "
+                "CONFIG SET notify-keyspace-events KA"
+            )
+
+
+class MonitorSubscriber:
+    """Commands from the server's MONITOR stream, one in ``sample_rate`` of them.
+
+    Every line still crosses the network and is read, but only sampled lines are parsed
+    and become ``monitor:<command>`` messages whose payload is the quoted arguments, so
+    the client keeps up with servers doing far more operations than it could display.
+    ``key_pattern`` keeps only commands whose first argument matches it.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        key_pattern: str = "*",
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        batch_interval: float = BATCH_INTERVAL,
+        batch_size: int = BATCH_SIZE,
+        on_status: Optional[StatusCallback] = None,
+    ):
+        self.redis_url = redis_url
+        self.key_pattern = None if key_pattern == "*" else key_pattern.encode("utf-8")
+        self.sample_rate = max(sample_rate, 1)
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self.status = StatusReporter(on_status)
+        self.backoff = Backoff()
+        self.pool = get_pool(redis_url)
+        self.channel_names = ChannelNames()
+        self._stopping = threading.Event()
+
+    def run(self, on_batch: Callable[[list[Message]], None]):
+        for batch in self.batches():
+            on_batch(batch)
+
+    def batches(self) -> Iterator[list[Message]]:
+        stopping = self._stopping
+        sample_rate = self.sample_rate
+        seen = 0
+        while not stopping.is_set():
+            batch: list[Message] = []
+            connection = None
+            try:
+                connection = self.pool.get_connection("MONITOR")
+                connection.send_command("MONITOR")
+                connection.read_response()
+                if self.backoff.attempts:
+                    self.backoff.reset()
+                    self.status.report("Monitoring")
+                deadline = time.monotonic() + self.batch_interval
+                while not stopping.is_set():
+                    timeout = max(deadline - time.monotonic(), 0.0)
+                    if connection.can_read(timeout=timeout):
+                        line = connection.read_response()
+                        seen += 1
+                        if seen % sample_rate == 0:
+                            message = self._message(line)
+                            if message is not None:
+                                batch.append(message)
+
+                    if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                        if batch:
+                            yield batch
+                            batch = []
+                        deadline = time.monotonic() + self.batch_interval
+                if batch:
+                    yield batch
+            except (RedisTimeoutError, RedisConnectionError):
+                if batch:
+                    yield batch
+                self.status.report("Wait For Connection ...")
+                stopping.wait(self.backoff.next_delay())
+            except RedisError as error:
+                # Refused outright, e.g. NOPERM under an ACL; retrying would not help
+                if batch:
+                    yield batch
+                self.status.report(f"MONITOR failed: {error}")
+                return
+            finally:
+                if connection is not None:
+                    # A connection in MONITOR mode cannot run other commands again
+                    connection.disconnect()
+                    self.pool.release(connection)
+
+    def stop(self):
+        self._stopping.set()
+
+    def _message(self, line: bytes) -> Optional[Message]:
+        parsed = parse_monitor_line(line)
+        if parsed is None:
+            return None
+        command, arguments = parsed
+        if self.key_pattern is not None and not fnmatchcase(
+            quoted_argument(arguments), self.key_pattern
+        ):
+            return None
+        return self.channel_names(b"monitor:" + command), arguments, time.time()
@@ -0,0 +1,137 @@
+"""Keyspace notifications and sampled MONITOR output as message sources.
+
+Both deliver batches like ``Subscriber``: a ``keyspace:<event>`` or ``monitor:<command>``
+channel per command, so the channel list shows the command mix. ``EventCounters`` adds
+up the commands and the hottest keys and key prefixes as events arrive. The sources
+themselves are in ``core.event_subscribers``, which ``create_event_subscriber`` imports, so
+the counters and constants can be used without loading redis.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import Optional
+
+from .decoding import decode_text
+from .messages import Message
+from .sketch import DEFAULT_TOP, TopK
+
+
+PUBSUB = "pubsub"  # Application pub/sub channels
+KEYSPACE = "keyspace"  # Keyspace notifications
+MONITOR = "monitor"  # Commands sampled from MONITOR
+MODES = (PUBSUB, KEYSPACE, MONITOR)
+
+DEFAULT_SAMPLE_RATE = 10  # MONITOR lines read per line parsed and forwarded
+DEFAULT_PREFIX_DEPTH = 1  # Key segments kept in a prefix, e.g. "user:*" for "user:42:cart"
+KEY_SEPARATOR = b":"
+KEYSPACE_EVENT_CLASSES = "Ag$lshzxetmnd"  # notify-keyspace-events flags naming event types
+
+
+def quoted_argument(arguments: bytes) -> bytes:
+    """The first ``"..."`` argument of a MONITOR line, still escaped."""
+    if not arguments.startswith(b'"'):
+        return b""
+    end = arguments.find(b'"', 1)
+    while end > 0 and _escaped(arguments, end):
+        end = arguments.find(b'"', end + 1)
+    return arguments[1:end] if end > 0 else arguments[1:]
+
+
+def _escaped(data: bytes, position: int) -> bool:
+    """Whether the character at ``position`` follows an odd run of backslashes."""
+    start = position
+    while start > 0 and data[start - 1] == ord("\\"):
+        start -= 1
+    return (position - start) % 2 == 1
+
+
+def parse_monitor_line(line: bytes) -> Optional[tuple[bytes, bytes]]:
+    """``(command, quoted arguments)`` of a line like
+    ``1339518083.107412 [0 127.0.0.1:60866] "set" "user:42" "x"``.
+    """
+    start = line.find(b'] "')
+    if start < 0:
+        return None
+    end = line.find(b'"', start + 3)
+    if end < 0:
+        return None
+    return line[start + 3 : end].lower(), line[end + 2 :]
+
+
+def key_prefix(key: bytes, depth: int = DEFAULT_PREFIX_DEPTH) -> bytes:
+    parts = key.split(KEY_SEPARATOR, depth)
+    if len(parts) <= depth:
+        return key
+    return KEY_SEPARATOR.join(parts[:depth]) + KEY_SEPARATOR + b"*"
+
+
+def create_event_subscriber(
+    mode: str,
+    redis_url: str,
+    key_pattern: str = "*",
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    **kwargs,
+):
+    # Like create_subscriber, this is where redis first gets imported
+    from .event_subscribers import KeyspaceSubscriber, MonitorSubscriber
+
+    if mode == KEYSPACE:
+        return KeyspaceSubscriber(redis_url, key_pattern, **kwargs)
+    if mode == MONITOR:
+        return MonitorSubscriber(redis_url, key_pattern, sample_rate, **kwargs)
+    raise ValueError(f"Unknown event mode: {mode}")
+
+
+class EventCounters:
+    """Command mix, hot keys and hot key prefixes of keyspace or MONITOR events.
+
+    Commands are few and counted exactly. Keys and prefixes go through ``TopK`` sketches,
+    so memory stays fixed however many distinct keys the server touches. Each batch is
+    pre-aggregated with a ``Counter`` first, so a hot key costs one sketch update per
+    batch, and events sampled 1 in N count N times.
+    """
+
+    def __init__(self, top: int = DEFAULT_TOP, prefix_depth: int = DEFAULT_PREFIX_DEPTH):
+        self.prefix_depth = prefix_depth
+        self.total = 0
+        self.commands: Counter[str] = Counter()
+        self.keys: TopK[bytes] = TopK(top)
+        self.prefixes: TopK[bytes] = TopK(top)
+        self._lock = threading.Lock()
+
+    def add_batch(self, batch: list[Message], weight: int = 1):
+        channels: Counter[str] = Counter()
+        keys: Counter[bytes] = Counter()
+        for channel, payload, _ in batch:
+            channels[channel] += weight
+            key = quoted_argument(payload) if channel.startswith("monitor:") else payload
+            if key:
+                keys[key] += weight
+        prefixes: Counter[bytes] = Counter()
+        for key, count in keys.items():
+            prefixes[key_prefix(key, self.prefix_depth)] += count
+
+        with self._lock:
+            self.total += len(batch) * weight
+            for channel, count in channels.items():
+                self.commands[channel.partition(":")[2]] += count
+            self.keys.update(keys)
+            self.prefixes.update(prefixes)
+
+    def snapshot(self, count: int = DEFAULT_TOP) -> dict[str, list[tuple[str, int]]]:
+        """The busiest commands, key prefixes and keys with their (estimated) counts."""
+        with self._lock:
+            return {
+                "commands": self.commands.most_common(count),
+                "prefixes": [(decode_text(key), n) for key, n in self.prefixes.top(count)],
+                "keys": [(decode_text(key), n) for key, n in self.keys.top(count)],
+            }
+
+    def clear(self):
+        with self._lock:
+            self.total = 0
+            self.commands.clear()
+            self.keys.clear()
+            self.prefixes.clear()
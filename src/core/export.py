@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import importlib.util
+import io
+import itertools
+import json
+import os
+import queue
+import threading
+from typing import Iterable, Iterator, Optional
+
+from .connection import StatusCallback, StatusReporter
+from .message_store import MessageBuffer
+from .messages import Message
+
+
+DEFAULT_ROTATE_BYTES = 256 * 1024 * 1024  # Uncompressed bytes per file before rotating
+MAX_PENDING_BATCHES = 64  # Writers block producers once this many batches are queued
+WRITE_CHUNK = 1000  # Messages formatted and written per file write
+GZIP_LEVEL = 5  # Most of gzip's ratio at a fraction of level 9's CPU time
+
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+
+
+def format_ndjson(channel: str, payload: bytes, timestamp: float) -> bytes:
+    """One JSON line with the receive time; binary payloads are stored as base64."""
+    record: dict[str, object] = {"time": timestamp, "channel": channel}
+    try:
+        record["data"] = payload.decode("utf-8")
+    except UnicodeDecodeError:
+        record["data_base64"] = base64.b64encode(payload).decode("ascii")
+    return json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def zstd_available() -> bool:
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def compression_for(path: str) -> Optional[str]:
+    """Compression implied by the file suffix: ``.gz`` or ``.zst``, else none."""
+    return COMPRESSION_SUFFIXES.get(os.path.splitext(path)[1])
+
+
+def _open_output(path: str, compression: Optional[str]) -> io.BufferedIOBase:
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=GZIP_LEVEL)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+    return open(path, "wb")
+
+
+def _open_input(path: str) -> io.BufferedIOBase:
+    compression = compression_for(path)
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "zstd":
+        import zstandard
+
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")))
+    return open(path, "rb")
+
+
+def read_ndjson(path: str) -> Iterator[Message]:
+    """Messages from a file written by ``NdjsonWriter``, in file order."""
+    with _open_input(path) as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "data_base64" in record:
+                payload = base64.b64decode(record["data_base64"])
+            else:
+                payload = record["data"].encode("utf-8")
+            yield record["channel"], payload, record["time"]
+
+
+class NdjsonWriter:
+    """Streams messages to NDJSON files from its own thread.
+
+    ``write`` only queues an iterable of messages; formatting, compression and disk I/O
+    happen on the writer thread. Output rotates to ``name.1.ndjson``, ``name.2.ndjson``, ...
+    once a file has taken ``rotate_bytes`` uncompressed bytes (0 disables rotation).
+    Compression follows the path suffix unless given explicitly. Once the last file is
+    closed, ``on_status`` is told how many messages were written; a failure is reported at once.
+    Asking for zstd without the zstandard package raises RuntimeError straight away.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rotate_bytes: int = DEFAULT_ROTATE_BYTES,
+        compression: Optional[str] = None,
+        on_status: Optional[StatusCallback] = None,
+    ):
+        self.path = path
+        self.rotate_bytes = rotate_bytes
+        self.compression = compression or compression_for(path)
+        if self.compression == "zstd" and not zstd_available():
+            raise RuntimeError("zstd compression needs the 'zstandard' package")
+        self.files: list[str] = []
+        self.messages_written = 0
+        self.error: Optional[Exception] = None
+        self.status = StatusReporter(on_status)
+
+        self._queue: queue.Queue[Optional[Iterable[Message]]] = queue.Queue(MAX_PENDING_BATCHES)
+        self._finished = False
+        self._thread = threading.Thread(target=self._run, name="ndjson-writer")
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def write(self, messages: Iterable[Message]):
+        if not self._finished:
+            self._queue.put(messages)
+
+    def finish(self):
+        """Write everything queued so far, then close the file without waiting for it."""
+        if not self._finished:
+            self._finished = True
+            self._queue.put(None)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        self.finish()
+        self._thread.join(timeout)
+        return self.done
+
+    def _part_path(self, index: int) -> str:
+        if not index:
+            return self.path
+        root, suffix = os.path.splitext(self.path)
+        if suffix in COMPRESSION_SUFFIXES:
+            root, inner_suffix = os.path.splitext(root)
+            suffix = inner_suffix + suffix
+        return f"{root}.{index}{suffix}"
+
+    def _run(self):
+        output: Optional[io.BufferedIOBase] = None
+        written = 0
+        try:
+            while True:
+                messages = self._queue.get()
+                if messages is None:
+                    break
+                if self.error is not None:
+                    continue  # Keep draining so producers never block on a failed writer
+                iterator = iter(messages)
+                try:
+                    while chunk := list(itertools.islice(iterator, WRITE_CHUNK)):
+                        if output is None or (self.rotate_bytes and written >= self.rotate_bytes):
+                            if output is not None:
+                                output.close()
+                            part_path = self._part_path(len(self.files))
+                            output = _open_output(part_path, self.compression)
+                            self.files.append(part_path)
+                            written = 0
+                        data = b"".join(format_ndjson(*message) for message in chunk)
+                        output.write(data)
+                        written += len(data)
+                        self.messages_written += len(chunk)
+                except Exception as error:  # Disk, compressor or a history read mid-export
+                    self._fail(error)
+        finally:
+            if output is not None:
+                try:
+                    output.close()
+                except Exception as error:
+                    self._fail(error)
+        if self.error is None:
+            self.status.report(f"Wrote {self.messages_written:,} messages to {self.path}")
+
+    def _fail(self, error: Exception):
+        if self.error is None:
+            self.error = error
+            self.status.report(f"Writing {self.path} failed: {error}")
+
+
+def export_history(
+    path: str, histories: Iterable[tuple[str, MessageBuffer]], **kwargs
+) -> NdjsonWriter:
+    """Write the buffered history of several channels without waiting for the disk.
+
+    Each buffer is copied in one step on the calling thread, so the caller may keep
+    appending while the writer formats and writes the copies. The writer gets all of
+    them as one iterable, so the calling thread never waits for queue space.
+    """
+    writer = NdjsonWriter(path, **kwargs)
+    copies = []
+    for channel_name, buffer in histories:
+        timestamps, payloads = buffer.snapshot()
+        copies.append(zip(itertools.repeat(channel_name), payloads, timestamps))
+    writer.write(itertools.chain.from_iterable(copies))
+    writer.finish()
+    return writer
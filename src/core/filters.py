@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import re
+from fnmatch import fnmatchcase
+from typing import Callable, Optional, TypeVar
+
+from .search import JSON_FIELD, SearchQuery
+from .messages import Message
+
+
+MAX_CACHED_CHANNELS = 100_000  # Channel decisions kept before the cache starts over
+
+INCLUDE = "include"  # Only channels matching an include rule pass, if there are any
+EXCLUDE = "exclude"  # Channels matching an exclude rule never pass
+KEEP = "keep"  # Only payloads matching a keep rule pass, if there are any
+DROP = "drop"  # Payloads matching a drop rule never pass
+ACTIONS = (INCLUDE, EXCLUDE, KEEP, DROP)
+
+REGEX_PREFIX = "re:"
+JSON_PREFIX = "json:"
+
+Rule = tuple[str, str]
+ChannelTest = Callable[[str], bool]
+PayloadTest = Callable[[bytes], bool]
+# Channel verdict cache, channel test and payload test, swapped as one value
+FilterState = tuple[dict[str, bool], ChannelTest, Optional[PayloadTest]]
+
+_Value = TypeVar("_Value", str, bytes)
+
+
+def parse_rules(text: str) -> list[Rule]:
+    """Parse ``<action> <expression>`` lines; blank lines and ``#`` comments are skipped.
+
+    ``include``/``exclude`` take a channel glob, ``keep``/``drop`` a payload substring.
+    Either takes ``re:<regex>`` instead, and payload rules also ``json:<path>[=<value>]``.
+    """
+    rules = []
+    for number, line in enumerate(text.splitlines(), 1):
+        if line.lstrip().startswith("#"):
+            continue
+        action, _, expression = line.strip().partition(" ")
+        expression = expression.strip()
+        if not action:
+            continue
+        if action not in ACTIONS or not expression:
+            raise ValueError(
+                f"Line {number}: expected '<{'|'.join(ACTIONS)}> <expression>', got {line!r}"
+            )
+        try:
+            _compile_rule(action, expression)
+        except (re.error, ValueError) as error:
+            raise ValueError(f"Line {number}: {error}") from None
+        rules.append((action, expression))
+    return rules
+
+
+def format_rules(rules: list[Rule]) -> str:
+    return "\n".join(f"{action} {expression}" for action, expression in rules)
+
+
+def _compile_rule(action: str, expression: str) -> ChannelTest | PayloadTest:
+    """A predicate on the channel name or the payload, whichever the rule applies to."""
+    if action in (INCLUDE, EXCLUDE):
+        return _channel_test(expression)
+    return _payload_test(expression)
+
+
+def _channel_test(expression: str) -> ChannelTest:
+    if expression.startswith(REGEX_PREFIX):
+        pattern = re.compile(expression[len(REGEX_PREFIX) :])
+        return lambda channel_name: pattern.search(channel_name) is not None
+    if expression.startswith(JSON_PREFIX):
+        raise ValueError(f"{JSON_PREFIX} only applies to keep and drop rules")
+    return lambda channel_name: fnmatchcase(channel_name, expression)
+
+
+def _payload_test(expression: str) -> PayloadTest:
+    if expression.startswith(REGEX_PREFIX):
+        pattern = re.compile(expression[len(REGEX_PREFIX) :].encode("utf-8"))
+        return lambda payload: pattern.search(payload) is not None
+    if expression.startswith(JSON_PREFIX):
+        query = SearchQuery(expression[len(JSON_PREFIX) :], JSON_FIELD, case_sensitive=True)
+        if not query.path:
+            raise ValueError(f"Expected a field path after {JSON_PREFIX}")
+        return query.matches
+    needle = expression.encode("utf-8")
+    return lambda payload: needle in payload
+
+
+def _any(predicates: list[Callable[[_Value], bool]]) -> Optional[Callable[[_Value], bool]]:
+    if not predicates:
+        return None
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda value: any(predicate(value) for predicate in predicates)
+
+
+class FilterEngine:
+    """Client-side channel and payload filters applied to batches before they are queued.
+
+    Rules are compiled once per ``set_rules``. The channel verdict is cached per name, so
+    a message pays one dict lookup unless payload rules exist, which are then checked
+    on its payload. Rules may be replaced from another thread while batches are filtered:
+    the compiled state is swapped in one assignment.
+    """
+
+    def __init__(self, rules: Optional[list[Rule]] = None):
+        self.rules: list[Rule] = []
+        self.filtered = 0  # Messages removed since the last clear
+        self._state: FilterState
+        self.set_rules(rules or [])
+
+    @property
+    def active(self) -> bool:
+        return bool(self.rules)
+
+    def set_rules(self, rules: list[Rule]):
+        channel_tests: dict[str, list[ChannelTest]] = {INCLUDE: [], EXCLUDE: []}
+        payload_tests: dict[str, list[PayloadTest]] = {KEEP: [], DROP: []}
+        for action, expression in rules:
+            if action in channel_tests:
+                channel_tests[action].append(_channel_test(expression))
+            else:
+                payload_tests[action].append(_payload_test(expression))
+        include = _any(channel_tests[INCLUDE])
+        exclude = _any(channel_tests[EXCLUDE])
+        keep = _any(payload_tests[KEEP])
+        drop = _any(payload_tests[DROP])
+
+        def channel_test(name: str) -> bool:
+            if include is not None and not include(name):
+                return False
+            return exclude is None or not exclude(name)
+
+        def test_payload(payload: bytes) -> bool:
+            if keep is not None and not keep(payload):
+                return False
+            return drop is None or not drop(payload)
+
+        payload_test = test_payload if keep is not None or drop is not None else None
+        # New state first: a reader that sees the new rules also sees their tests
+        self._state = ({}, channel_test, payload_test)
+        self.rules = list(rules)
+
+    def allows_channel(self, channel_name: str) -> bool:
+        decisions, channel_test, _ = self._state
+        allowed = decisions.get(channel_name)
+        if allowed is None:
+            allowed = self._decide(decisions, channel_test, channel_name)
+        return allowed
+
+    def apply(self, batch: list[Message]) -> list[Message]:
+        """The messages of ``batch`` that pass the filters."""
+        if not self.rules:
+            return batch
+        decisions, channel_test, payload_test = self._state
+        kept = []
+        for message in batch:
+            allowed = decisions.get(message[0])
+            if allowed is None:
+                allowed = self._decide(decisions, channel_test, message[0])
+            if allowed and (payload_test is None or payload_test(message[1])):
+                kept.append(message)
+        self.filtered += len(batch) - len(kept)
+        return kept
+
+    def clear(self):
+        self.filtered = 0
+
+    @staticmethod
+    def _decide(decisions: dict[str, bool], channel_test: ChannelTest, channel_name: str) -> bool:
+        if len(decisions) >= MAX_CACHED_CHANNELS:
+            decisions.clear()
+        allowed = decisions[channel_name] = channel_test(channel_name)
+        return allowed
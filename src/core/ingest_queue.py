@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from collections import deque
+from typing import Optional
+
+from .messages import Message
+
+
+DEFAULT_CAPACITY = 50_000  # Messages queued before the overload policy kicks in
+DEFAULT_SAMPLE_RATE = 10  # Keep 1 in N messages per channel while sampling
+
+DROP_OLDEST = "drop-oldest"
+KEEP_LATEST = "keep-latest"
+SAMPLE = "sample"
+POLICIES = (DROP_OLDEST, KEEP_LATEST, SAMPLE)
+
+
+class IngestQueue:
+    """Bounded, thread-safe hand-off between a subscriber thread and its consumer.
+
+    Once ``capacity`` messages are waiting, the policy decides what survives:
+
+    * ``drop-oldest`` discards the oldest queued messages,
+    * ``keep-latest`` keeps only the newest overflow message of each channel,
+    * ``sample`` admits 1 in ``sample_rate`` overflow messages per channel.
+
+    Every discarded message is counted per channel. Messages are drained in arrival order:
+    while keep-latest overflow entries wait, later messages join them rather than the deque.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        policy: str = DROP_OLDEST,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overload policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.sample_rate = max(sample_rate, 1)
+        self.dropped_total = 0
+
+        self._lock = threading.Lock()
+        self._messages: deque[Message] = deque()
+        self._latest: dict[str, Message] = {}
+        self._sample_counters: dict[str, int] = {}
+        self._dropped: dict[str, int] = {}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._messages) + len(self._latest)
+
+    def set_policy(self, policy: str):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overload policy: {policy}")
+        with self._lock:
+            if self._latest and policy != KEEP_LATEST:
+                # Only keep-latest puts behind the overflow table, so empty it first
+                self._messages.extend(self._latest.values())
+                self._latest.clear()
+            self.policy = policy
+
+    def put(self, batch: list[Message]) -> bool:
+        """Queue a batch. Returns True if the queue was empty, so the consumer needs waking."""
+        with self._lock:
+            was_empty = not self._messages and not self._latest
+            messages = self._messages
+            free = self.capacity - len(messages)
+            if len(batch) <= free and not self._latest:
+                messages.extend(batch)
+            elif self.policy == DROP_OLDEST:
+                self._put_drop_oldest(batch)
+            elif self.policy == KEEP_LATEST:
+                self._put_keep_latest(batch, free)
+            else:
+                self._put_sample(batch, free)
+            return was_empty
+
+    def drain(self, limit: Optional[int] = None) -> list[Message]:
+        with self._lock:
+            messages = self._messages
+            if limit is None or limit >= len(messages) + len(self._latest):
+                drained = list(messages)
+                messages.clear()
+                # Overflow entries arrived after everything in the deque
+                drained.extend(self._latest.values())
+                self._latest.clear()
+                return drained
+            count = min(limit, len(messages))
+            drained = [messages.popleft() for _ in range(count)]
+            latest = self._latest
+            if count < limit and latest:
+                # The deque is empty; continue with the oldest overflow entries
+                for channel_name in list(itertools.islice(latest, limit - count)):
+                    drained.append(latest.pop(channel_name))
+            return drained
+
+    def take_dropped(self) -> dict[str, int]:
+        """Per-channel counts of messages discarded since the previous call."""
+        with self._lock:
+            dropped, self._dropped = self._dropped, {}
+            return dropped
+
+    def clear(self):
+        with self._lock:
+            self._messages.clear()
+            self._latest.clear()
+            self._sample_counters.clear()
+            self._dropped.clear()
+            self.dropped_total = 0
+
+    def _drop(self, channel_name: str):
+        self._dropped[channel_name] = self._dropped.get(channel_name, 0) + 1
+        self.dropped_total += 1
+
+    def _put_drop_oldest(self, batch: list[Message]):
+        messages = self._messages
+        messages.extend(batch)
+        while len(messages) > self.capacity:
+            self._drop(messages.popleft()[0])
+
+    def _put_keep_latest(self, batch: list[Message], free: int):
+        latest = self._latest
+        if free > 0 and not latest:
+            self._messages.extend(batch[:free])
+            batch = batch[free:]
+        for message in batch:
+            channel_name = message[0]
+            if latest.pop(channel_name, None) is not None:
+                self._drop(channel_name)
+            # Re-inserting moves the channel to the end, keeping the table in arrival order
+            latest[channel_name] = message
+
+    def _put_sample(self, batch: list[Message], free: int):
+        messages = self._messages
+        if free > 0:
+            messages.extend(batch[:free])
+            batch = batch[free:]
+        counters = self._sample_counters
+        for message in batch:
+            channel_name = message[0]
+            seen = counters.get(channel_name, 0) + 1
+            counters[channel_name] = seen
+            if (seen - 1) % self.sample_rate:
+                self._drop(channel_name)
+                continue
+            # The queue stays bounded: a sampled message replaces the oldest one
+            self._drop(messages.popleft()[0])
+            messages.append(message)
@@ -0,0 +1,203 @@
+"""Optional timings of the ingest and render pipeline, plus profiler and allocation dumps.
+
+Code on the hot path brackets a stage with ``instruments.start()`` and
+``instruments.stop(stage, started, items)``. While recording is off, ``start`` returns 0.0
+and ``stop`` returns at once, so a stage costs two method calls per batch or frame and
+nothing per message.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from .metrics import HISTOGRAM_BUCKETS, histogram_quantile
+from .messages import Message
+
+if TYPE_CHECKING:
+    import cProfile
+
+
+TRACEMALLOC_FRAMES = 10  # Stack frames kept per traced allocation
+
+INGEST = "ingest"
+SIGNAL = "signal"
+QUEUE_WAIT = "queue_wait"
+STORE = "store"
+CHANNEL_LIST = "channel_list"
+OUTPUT_WINDOWS = "output_windows"
+HIGHLIGHT = "highlight"
+FRAME = "frame"
+DECODE = "decode"
+# Stage name -> label, in pipeline order
+STAGES = {
+    INGEST: "Subscriber bookkeeping",
+    SIGNAL: "Wake-up signal",
+    QUEUE_WAIT: "Time since receipt",
+    STORE: "Store messages",
+    CHANNEL_LIST: "Channel list updates",
+    OUTPUT_WINDOWS: "Output windows",
+    HIGHLIGHT: "Highlight fades",
+    FRAME: "Whole frame",
+    DECODE: "Payload decoding",
+}
+
+QUEUE_DEPTH = "queue_depth"  # Gauge: messages waiting in the ingest queue at each drain
+
+
+class StageStats:
+    """Calls, items and busy time of one stage, with a log2 histogram of call durations."""
+
+    def __init__(self):
+        self.calls = 0
+        self.items = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.histogram = array("I", [0] * HISTOGRAM_BUCKETS)
+
+    def add(self, seconds: float, items: int):
+        self.calls += 1
+        self.items += items
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+        micros = max(int(seconds * 1_000_000), 0)
+        self.histogram[min(micros.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+
+class Instrumentation:
+    """Per-stage counters and latency histograms, off until ``enabled`` is set.
+
+    Stages are recorded from the subscriber, GUI and decode threads alike, so recording
+    takes a lock; it is only reached while enabled. ``snapshot`` reports every stage
+    seen since the last ``clear``.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.since = time.monotonic()
+        self._lock = threading.Lock()
+        self._stages: dict[str, StageStats] = {}
+        self._gauges: dict[str, tuple[float, float]] = {}  # name -> (latest, maximum)
+        self._marks: dict[str, float] = {}
+        self._profile: Optional[cProfile.Profile] = None
+
+    def start(self) -> float:
+        return time.perf_counter() if self.enabled else 0.0
+
+    def stop(self, stage: str, started: float, items: int = 1):
+        if started:
+            self.record(stage, time.perf_counter() - started, items)
+
+    def record(self, stage: str, seconds: float, items: int = 1):
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.add(seconds, items)
+
+    def record_ages(self, stage: str, messages: Iterable[Message], now: float):
+        """Record ``now`` minus each message's receive timestamp."""
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            for _, _, timestamp in messages:
+                stats.add(max(now - timestamp, 0.0), 1)
+
+    def mark(self, stage: str):
+        """Start a stage that ends on another thread, e.g. a queued Qt signal."""
+        if self.enabled:
+            self._marks[stage] = time.perf_counter()
+
+    def stop_mark(self, stage: str):
+        started = self._marks.pop(stage, 0.0)
+        if started and self.enabled:
+            self.record(stage, time.perf_counter() - started)
+
+    def gauge(self, name: str, value: float):
+        with self._lock:
+            _, maximum = self._gauges.get(name, (0.0, 0.0))
+            self._gauges[name] = (value, max(value, maximum))
+
+    def snapshot(self) -> dict:
+        """Elapsed seconds, ``{stage: stats dict}`` and ``{gauge: (latest, maximum)}``."""
+        with self._lock:
+            stages = {}
+            for stage, stats in self._stages.items():
+                counts = stats.histogram.tolist()
+                stages[stage] = {
+                    "calls": stats.calls,
+                    "items": stats.items,
+                    "total": stats.total,
+                    "max": stats.maximum,
+                    # Quantiles are interpolated within log2 buckets, so never past the maximum
+                    "p50": min(histogram_quantile(counts, 0.5) or 0.0, stats.maximum),
+                    "p99": min(histogram_quantile(counts, 0.99) or 0.0, stats.maximum),
+                }
+            gauges = dict(self._gauges)
+        return {"elapsed": time.monotonic() - self.since, "stages": stages, "gauges": gauges}
+
+    def clear(self):
+        with self._lock:
+            self._stages.clear()
+            self._gauges.clear()
+            self._marks.clear()
+            self.since = time.monotonic()
+
+    @property
+    def profiling(self) -> bool:
+        return self._profile is not None
+
+    def start_profile(self):
+        """Profile the calling thread, normally the GUI thread, until ``stop_profile``."""
+        import cProfile
+
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop_profile(self, path: str):
+        """Stop profiling and write pstats data, e.g. for ``python -m pstats`` or snakeviz.
+
+        If writing fails the OSError propagates and the profile is kept, so it can be saved
+        elsewhere; profiling stays paused until then.
+        """
+        profile = self._profile
+        if profile is None:
+            return
+        profile.disable()
+        profile.dump_stats(path)
+        self._profile = None
+
+    # tracemalloc, like cProfile, is imported on first use to keep it out of startup
+
+    @property
+    def tracing(self) -> bool:
+        import tracemalloc
+
+        return tracemalloc.is_tracing()
+
+    def start_tracing(self):
+        import tracemalloc
+
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    def dump_allocations(self, path: str) -> int:
+        """Write a tracemalloc snapshot, readable with ``tracemalloc.Snapshot.load``.
+
+        Returns the traced bytes currently allocated.
+        """
+        import tracemalloc
+
+        tracemalloc.take_snapshot().dump(path)
+        return tracemalloc.get_traced_memory()[0]
+
+    def stop_tracing(self):
+        import tracemalloc
+
+        tracemalloc.stop()
+
+
+instruments = Instrumentation()  # Shared by every thread of the process
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterator
+
+
+DEFAULT_MAX_MESSAGES = 1000  # Messages kept per channel
+DEFAULT_MAX_BYTES = 1024 * 1024  # Payload bytes kept per channel
+
+
+class MessageBuffer:
+    """Ring buffer of raw payloads and receive timestamps for one channel.
+
+    The oldest messages are evicted once either ``capacity`` messages or ``max_bytes``
+    payload bytes are held. Messages keep a 1-based sequence number that survives eviction.
+    """
+
+    __slots__ = (
+        "capacity",
+        "max_bytes",
+        "total",
+        "nbytes",
+        "_payloads",
+        "_timestamps",
+        "_start",
+        "_size",
+    )
+
+    def __init__(self, capacity: int = DEFAULT_MAX_MESSAGES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.capacity = max(capacity, 1)
+        self.max_bytes = max_bytes
+        self.total = 0
+        self.nbytes = 0
+        self._payloads: list[bytes] = []
+        self._timestamps = array("d")
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def first_seq(self) -> int:
+        return self.total - self._size + 1
+
+    def append(self, payload: bytes, timestamp: float):
+        if self._size == self.capacity:
+            self._evict()
+
+        if len(self._payloads) < self.capacity:
+            # Still growing: the live region always ends at the end of the lists
+            self._payloads.append(payload)
+            self._timestamps.append(timestamp)
+        else:
+            position = (self._start + self._size) % self.capacity
+            self._payloads[position] = payload
+            self._timestamps[position] = timestamp
+        self._size += 1
+        self.total += 1
+        self.nbytes += len(payload)
+
+        while self.nbytes > self.max_bytes and self._size > 1:
+            self._evict()
+
+    def get(self, index: int) -> tuple[int, float, bytes]:
+        """Return (seq, timestamp, payload) for the index-th buffered message."""
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        position = (self._start + index) % len(self._payloads)
+        return self.first_seq + index, self._timestamps[position], self._payloads[position]
+
+    def tail(self, count: int) -> Iterator[tuple[int, float, bytes]]:
+        for index in range(max(self._size - count, 0), self._size):
+            yield self.get(index)
+
+    def since(self, seq: int) -> Iterator[tuple[int, float, bytes]]:
+        """Yield buffered messages with a sequence number greater than ``seq``."""
+        for index in range(max(seq - self.first_seq + 1, 0), self._size):
+            yield self.get(index)
+
+    def __iter__(self):
+        return self.tail(self._size)
+
+    def snapshot(self) -> tuple[list[float], list[bytes]]:
+        """Copies of the buffered timestamps and payloads, oldest first."""
+        start = self._start
+        end = start + self._size
+        if end <= len(self._payloads):
+            return self._timestamps[start:end].tolist(), self._payloads[start:end]
+        end -= len(self._payloads)
+        return (
+            self._timestamps[start:].tolist() + self._timestamps[:end].tolist(),
+            self._payloads[start:] + self._payloads[:end],
+        )
+
+    def resize(self, capacity: int, max_bytes: int):
+        messages = list(self.tail(capacity))
+        total = self.total
+        self.capacity = max(capacity, 1)
+        self.max_bytes = max_bytes
+        self.clear()
+        for _, timestamp, payload in messages:
+            self.append(payload, timestamp)
+        self.total = total
+
+    def clear(self):
+        self._payloads.clear()
+        del self._timestamps[:]
+        self._start = 0
+        self._size = 0
+        self.nbytes = 0
+
+    def _evict(self):
+        position = self._start
+        self.nbytes -= len(self._payloads[position])
+        self._payloads[position] = b""
+        self._start = (self._start + 1) % len(self._payloads)
+        self._size -= 1
+
+
+class MessageStore:
+    """Per-channel message history with configurable count and byte caps."""
+
+    def __init__(
+        self, max_messages: int = DEFAULT_MAX_MESSAGES, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.buffers: dict[str, MessageBuffer] = {}
+
+    def __contains__(self, channel_name: str):
+        return channel_name in self.buffers
+
+    def get(self, channel_name: str) -> MessageBuffer | None:
+        return self.buffers.get(channel_name)
+
+    def append(self, channel_name: str, payload: bytes, timestamp: float) -> MessageBuffer:
+        buffer = self.buffers.get(channel_name)
+        if buffer is None:
+            buffer = self.buffers[channel_name] = MessageBuffer(self.max_messages, self.max_bytes)
+        buffer.append(payload, timestamp)
+        return buffer
+
+    def set_limits(self, max_messages: int, max_bytes: int):
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        for buffer in self.buffers.values():
+            buffer.resize(max_messages, max_bytes)
+
+    def clear(self):
+        self.buffers.clear()
@@ -0,0 +1,18 @@
+"""Message batches as every source delivers them; importing this never loads redis."""
+
+from __future__ import annotations
+
+import re
+
+
+BATCH_INTERVAL = 0.016  # Seconds to gather messages before handing a batch on
+BATCH_SIZE = 500  # Maximum number of messages per batch
+
+Message = tuple[str, bytes, float]  # (channel, payload, receive timestamp)
+
+SOURCE_SCHEMES = ("replay://", "synthetic://")  # URLs served by core.replay, not Redis
+
+
+def split_list(text: str) -> list[str]:
+    """Split a comma- or whitespace-separated list of URLs or patterns."""
+    return [part for part in re.split(r"[,\s]+", text) if part]
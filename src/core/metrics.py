@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from typing import Iterable, Optional
+
+from .messages import Message
+
+
+DEFAULT_WINDOW = 10  # Seconds covered by rates and inter-arrival percentiles
+HISTOGRAM_BUCKETS = 24  # log2 buckets of microseconds; the last one holds everything >= 4.2 s
+
+_EMPTY_HISTOGRAM = array("I", [0] * HISTOGRAM_BUCKETS)
+
+
+class ChannelMetrics:
+    """Sliding-window message rate, byte rate and inter-arrival percentiles per channel.
+
+    Each channel owns a slot in flat arrays that are sized once when the channel first
+    appears: ``window`` one-second buckets of message and byte counts, and two log2
+    histograms of inter-arrival times that take turns covering half a window each.
+    Recording a message is a few integer updates and allocates nothing.
+
+    Batches are recorded on the subscriber thread while the GUI thread reads, so every
+    method holds a lock; it is taken once per batch, not per message.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = max(window, 2)
+        self._lock = threading.Lock()
+        self._slots: dict[str, int] = {}
+        self._last_arrival = array("d")
+        self._last_second = array("q")
+        self._bucket_seconds = array("q")
+        self._message_counts = array("I")
+        self._byte_counts = array("Q")
+        self._generations = array("q")
+        self._histograms = array("I")
+
+    def __contains__(self, channel_name: str) -> bool:
+        return channel_name in self._slots
+
+    def add_batch(self, messages: Iterable[Message]):
+        window = self.window
+        half_window = window / 2
+        top_bucket = HISTOGRAM_BUCKETS - 1
+        with self._lock:
+            slots = self._slots
+            last_arrival = self._last_arrival
+            last_second = self._last_second
+            bucket_seconds = self._bucket_seconds
+            message_counts = self._message_counts
+            byte_counts = self._byte_counts
+            generations = self._generations
+            histograms = self._histograms
+            for channel_name, payload, timestamp in messages:
+                slot = slots.get(channel_name)
+                if slot is None:
+                    slot = self._add_slot(channel_name)
+
+                second = int(timestamp)
+                bucket = slot * window + second % window
+                if bucket_seconds[bucket] != second:
+                    bucket_seconds[bucket] = second
+                    message_counts[bucket] = 0
+                    byte_counts[bucket] = 0
+                message_counts[bucket] += 1
+                byte_counts[bucket] += len(payload)
+                last_second[slot] = second
+
+                # Out-of-order timestamps from several servers count towards the newest half
+                generation = max(int(timestamp / half_window), generations[slot])
+                if generation != generations[slot]:
+                    self._advance(slot, generation)
+                previous = last_arrival[slot]
+                last_arrival[slot] = timestamp
+                if previous:
+                    micros = max(int((timestamp - previous) * 1_000_000), 0)
+                    offset = slot * 2 * HISTOGRAM_BUCKETS + (generation & 1) * HISTOGRAM_BUCKETS
+                    histograms[offset + min(micros.bit_length(), top_bucket)] += 1
+
+    def rates(self, channel_name: str, now: float) -> tuple[float, float]:
+        """Messages and bytes per second over the window ending at ``now``."""
+        window = self.window
+        second = int(now)
+        oldest = second - window + 1
+        messages = nbytes = 0
+        with self._lock:
+            slot = self._slots.get(channel_name)
+            if slot is None or self._last_second[slot] < oldest:
+                return 0.0, 0.0
+            bucket_seconds = self._bucket_seconds
+            for bucket in range(slot * window, (slot + 1) * window):
+                if bucket_seconds[bucket] >= oldest:
+                    messages += self._message_counts[bucket]
+                    nbytes += self._byte_counts[bucket]
+        # The current second is only partly over
+        elapsed = window - 1 + (now - second)
+        return messages / elapsed, nbytes / elapsed
+
+    def percentiles(
+        self, channel_name: str, now: float, quantiles: Iterable[float] = (0.5, 0.99)
+    ) -> list[Optional[float]]:
+        """Inter-arrival time in seconds at each quantile, or None without recent arrivals."""
+        quantiles = list(quantiles)
+        generation = int(now / (self.window / 2))
+        with self._lock:
+            slot = self._slots.get(channel_name)
+            if slot is None or self._generations[slot] < generation - 1:
+                return [None] * len(quantiles)
+            written = self._generations[slot]
+            offset = slot * 2 * HISTOGRAM_BUCKETS
+            current = offset + (written & 1) * HISTOGRAM_BUCKETS
+            counts = self._histograms[current : current + HISTOGRAM_BUCKETS].tolist()
+            if written == generation:
+                # The previous half is still inside the window
+                previous = offset + ((written + 1) & 1) * HISTOGRAM_BUCKETS
+                previous_counts = self._histograms[previous : previous + HISTOGRAM_BUCKETS]
+                for bucket, count in enumerate(previous_counts):
+                    counts[bucket] += count
+        return [histogram_quantile(counts, quantile) for quantile in quantiles]
+
+    def clear(self):
+        with self._lock:
+            self._slots.clear()
+            for values in (
+                self._last_arrival,
+                self._last_second,
+                self._bucket_seconds,
+                self._message_counts,
+                self._byte_counts,
+                self._generations,
+                self._histograms,
+            ):
+                del values[:]
+
+    def _add_slot(self, channel_name: str) -> int:
+        slot = self._slots[channel_name] = len(self._last_arrival)
+        self._last_arrival.append(0.0)
+        self._last_second.append(0)
+        self._generations.append(0)
+        zeros = [0] * self.window
+        self._bucket_seconds.extend(zeros)
+        self._message_counts.extend(zeros)
+        self._byte_counts.extend(zeros)
+        self._histograms.extend(_EMPTY_HISTOGRAM)
+        self._histograms.extend(_EMPTY_HISTOGRAM)
+        return slot
+
+    def _advance(self, slot: int, generation: int):
+        """Start a new half window, keeping the previous half only if it is adjacent."""
+        offset = slot * 2 * HISTOGRAM_BUCKETS
+        halves = [generation & 1] if generation == self._generations[slot] + 1 else [0, 1]
+        for half in halves:
+            start = offset + half * HISTOGRAM_BUCKETS
+            self._histograms[start : start + HISTOGRAM_BUCKETS] = _EMPTY_HISTOGRAM
+        self._generations[slot] = generation
+
+
+def histogram_quantile(counts: list[int], quantile: float) -> Optional[float]:
+    total = sum(counts)
+    if not total:
+        return None
+    target = quantile * total
+    seen = 0
+    for bucket, count in enumerate(counts):
+        if count and seen + count >= target:
+            # Bucket b holds [2**(b-1), 2**b) microseconds; interpolate linearly inside it
+            lower = 1 << (bucket - 1) if bucket else 0
+            upper = 1 << bucket
+            return (lower + (upper - lower) * (target - seen) / count) / 1_000_000
+        seen += count
+    return None
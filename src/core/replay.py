@@ -0,0 +1,237 @@
+"""Stand-ins for a Redis subscription: recorded sessions and synthetic load.
+
+Both sources batch like ``Subscriber`` and share its ``run``/``batches``/``stop`` interface,
+so anything that accepts a subscriber accepts them. ``create_subscriber`` picks them for
+``replay://`` and ``synthetic://`` URLs.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import threading
+import time
+from fnmatch import fnmatchcase
+from typing import Callable, Iterator, Optional, TypeVar
+from urllib.parse import parse_qsl, urlsplit
+
+from .connection import StatusCallback, StatusReporter
+from .export import read_ndjson
+from .messages import BATCH_INTERVAL, BATCH_SIZE, Message
+
+
+_N = TypeVar("_N", int, float)
+
+
+class _Source:
+    def __init__(
+        self,
+        channel_patterns: Optional[list[str]] = None,
+        batch_interval: float = BATCH_INTERVAL,
+        batch_size: int = BATCH_SIZE,
+        on_status: Optional[StatusCallback] = None,
+    ):
+        self.channel_patterns = channel_patterns or ["*"]
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self.status = StatusReporter(on_status)
+        self._stopping = threading.Event()
+        self._matches: dict[str, bool] = {}
+
+    def run(self, on_batch: Callable[[list[Message]], None]):
+        for batch in self.batches():
+            on_batch(batch)
+
+    def batches(self) -> Iterator[list[Message]]:
+        if self.channel_patterns == ["*"]:
+            yield from self._generate()
+            return
+        for batch in self._generate():
+            batch = [message for message in batch if self._match(message[0])]
+            if batch:
+                yield batch
+
+    def stop(self):
+        self._stopping.set()
+
+    def _generate(self) -> Iterator[list[Message]]:
+        raise NotImplementedError
+
+    def _match(self, channel_name: str) -> bool:
+        matched = self._matches.get(channel_name)
+        if matched is None:
+            matched = self._matches[channel_name] = any(
+                fnmatchcase(channel_name, pattern) for pattern in self.channel_patterns
+            )
+        return matched
+
+
+class SyntheticSource(_Source):
+    """Deterministic load: the same seed yields the same channels and payloads in order.
+
+    Messages go to ``channels`` channels chosen uniformly at random, carry ``payload_size``
+    byte JSON payloads, and are paced to ``rate`` messages per second (0 means as fast as
+    the consumer takes them). ``count`` stops the source after that many messages.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10_000,
+        channels: int = 100,
+        payload_size: int = 128,
+        count: int = 0,
+        seed: int = 0,
+        channel_prefix: str = "synthetic.",
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.rate = rate
+        self.channels = max(channels, 1)
+        self.payload_size = payload_size
+        self.count = count
+        self.seed = seed
+        self.channel_prefix = channel_prefix
+
+    def _generate(self) -> Iterator[list[Message]]:
+        rng = random.Random(self.seed)
+        names = [sys.intern(f"{self.channel_prefix}{index}") for index in range(self.channels)]
+        head = b'{"seq": %d, "pad": "'
+        letters = b"abcdefghijklmnopqrstuvwxyz"
+        padding = bytes(rng.choice(letters) for _ in range(self.payload_size))
+        self.status.report("Generating synthetic traffic")
+
+        started = time.monotonic()
+        sent = 0
+        while not self._stopping.is_set():
+            if self.rate:
+                due = int((time.monotonic() - started) * self.rate) - sent
+                if due <= 0:
+                    self._stopping.wait(self.batch_interval)
+                    continue
+                size = min(due, self.batch_size)
+            else:
+                size = self.batch_size
+            if self.count:
+                size = min(size, self.count - sent)
+                if size <= 0:
+                    self.status.report("Synthetic traffic finished")
+                    return
+
+            now = time.time()
+            batch = []
+            for seq in range(sent, sent + size):
+                payload = head % seq
+                # Keep every payload at payload_size bytes, sequence number included
+                payload += padding[: max(self.payload_size - len(payload) - 2, 0)] + b'"}'
+                batch.append((names[rng.randrange(self.channels)], payload, now))
+            sent += size
+            yield batch
+
+
+class ReplaySource(_Source):
+    """Replays an NDJSON recording with its original spacing divided by ``speed``.
+
+    ``speed`` 0 replays as fast as the consumer takes messages. Replayed messages are
+    stamped with the time they are replayed; ``loop`` starts over at the end of the file.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+
+    def _generate(self) -> Iterator[list[Message]]:
+        stopping = self._stopping
+        while not stopping.is_set():
+            self.status.report(f"Replaying {self.path}")
+            replayed = 0
+            try:
+                for batch in self._replay_file():
+                    replayed += len(batch)
+                    yield batch
+            except Exception as error:  # Missing, unreadable or malformed recording
+                self.status.report(f"Cannot replay {self.path}: {error}")
+                return
+            if stopping.is_set():
+                return
+            if not replayed:
+                # Looping over an empty file would only spin
+                self.status.report(f"Nothing to replay in {self.path}")
+                return
+            if not self.loop:
+                self.status.report("Replay finished")
+                return
+
+    def _replay_file(self) -> Iterator[list[Message]]:
+        """One pass over the file; returns early once stopped."""
+        stopping = self._stopping
+        started = time.monotonic()
+        first_timestamp: Optional[float] = None
+        batch: list[Message] = []
+        deadline = 0.0
+        for channel_name, payload, timestamp in read_ndjson(self.path):
+            if stopping.is_set():
+                return
+            if first_timestamp is None:
+                first_timestamp = timestamp
+            if self.speed:
+                wait = started + (timestamp - first_timestamp) / self.speed - time.monotonic()
+                if wait > 0:
+                    # Hand on what is gathered before a pause that outlasts the batch
+                    if batch and time.monotonic() + wait >= deadline:
+                        yield batch
+                        batch = []
+                    if stopping.wait(wait):
+                        return
+            if not batch:
+                deadline = time.monotonic() + self.batch_interval
+            batch.append((sys.intern(channel_name), payload, time.time()))
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def create_source(url: str, channel_patterns: list[str], **kwargs) -> _Source:
+    """Source for ``synthetic://?rate=&channels=&size=&count=&seed=`` or
+    ``replay:///path/session.ndjson?speed=&loop=``.
+
+    Raises ValueError for an unknown scheme, a missing recording or a malformed option.
+    """
+    parts = urlsplit(url)
+    options = dict(parse_qsl(parts.query))
+    if parts.scheme == "synthetic":
+        return SyntheticSource(
+            rate=_number(options, "rate", 10_000.0, float),
+            channels=_number(options, "channels", 100, int),
+            payload_size=_number(options, "size", 128, int),
+            count=_number(options, "count", 0, int),
+            seed=_number(options, "seed", 0, int),
+            channel_patterns=channel_patterns,
+            **kwargs,
+        )
+    if parts.scheme == "replay":
+        path = parts.netloc + parts.path
+        if not os.path.isfile(path):
+            raise ValueError(f"No recording at {path}")
+        return ReplaySource(
+            path,
+            speed=_number(options, "speed", 1.0, float),
+            loop=options.get("loop", "0") not in ("0", "false", ""),
+            channel_patterns=channel_patterns,
+            **kwargs,
+        )
+    raise ValueError(f"Unknown source URL: {url}")
+
+
+def _number(options: dict[str, str], name: str, default: _N, convert: Callable[[str], _N]) -> _N:
+    value = options.get(name)
+    if value is None:
+        return default
+    try:
+        return convert(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {value!r}") from None
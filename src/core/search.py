@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import itertools
+import json
+import queue
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from fnmatch import fnmatchcase
+from typing import Iterator, Optional
+
+from .messages import Message
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse  # type: ignore[no-redef]
+
+
+DEFAULT_MAX_DOCUMENTS = 2_000_000  # Messages kept searchable; older ones age out
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # Payload bytes kept searchable; older ones age out
+INDEX_BYTES = 1024  # Leading payload bytes indexed; longer payloads are always verified
+BLOCK_BITS = 5  # Postings list blocks of 32 consecutive messages
+MAX_PENDING_BATCHES = 256  # Batches waiting for the indexer before new ones are skipped
+DEFAULT_LIMIT = 1000  # Results returned per query
+INDEX_CHUNK = 64  # Messages indexed between yields to other threads
+VERIFY_CHUNK = 4096  # Candidates verified per hold of the index lock
+
+_EMPTY = array("I")
+
+SUBSTRING = "substring"
+REGEX = "regex"
+JSON_FIELD = "json"
+MODES = (SUBSTRING, REGEX, JSON_FIELD)
+
+
+def _trigrams(data: bytes) -> set[bytes]:
+    return {data[index : index + 3] for index in range(len(data) - 2)}
+
+
+def regex_literals(pattern: str) -> list[str]:
+    """Literal runs every match of ``pattern`` must contain; empty if none can be proven."""
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return []
+    runs: list[str] = []
+    current: list[str] = []
+    for op, argument in parsed:
+        if op == sre_parse.LITERAL:
+            current.append(chr(argument))
+            continue
+        if op == sre_parse.BRANCH:
+            return []  # An alternation at the top level requires none of its branches
+        runs.append("".join(current))
+        current = []
+    runs.append("".join(current))
+    return [run for run in runs if len(run) >= 3]
+
+
+def json_field(payload: bytes, path: list[str]) -> tuple[bool, object]:
+    try:
+        value = json.loads(payload)
+    except ValueError:
+        return False, None
+    for key in path:
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return False, None
+    return True, value
+
+
+class SearchQuery:
+    """What to look for, and in which channels and time range.
+
+    ``text`` is a substring, a regular expression, or for JSON queries ``path.to.field``
+    (the field exists) or ``path.to.field=value`` (its value, compared as text).
+    """
+
+    def __init__(
+        self,
+        text: str,
+        mode: str = SUBSTRING,
+        channel_glob: str = "*",
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        case_sensitive: bool = False,
+        limit: int = DEFAULT_LIMIT,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        self.text = text
+        self.mode = mode
+        self.channel_glob = channel_glob or "*"
+        self.since = since
+        self.until = until
+        self.case_sensitive = case_sensitive
+        self.limit = limit
+
+        self.cancelled = False
+
+        self.path: list[str] = []
+        self.value: Optional[str] = None
+        self._raw_value: Optional[bytes] = None
+        if mode == JSON_FIELD:
+            path, separator, value = text.partition("=")
+            self.path = [key for key in path.strip().split(".") if key]
+            self.value = value.strip() if separator else None
+            if self.value and self.value.isascii() and not set(self.value) & {'"', "\\"}:
+                # Appears verbatim in any JSON that holds it, so rules out most payloads cheaply
+                self._raw_value = self.value.lower().encode("ascii")
+        elif mode == REGEX:
+            # Raises re.error for an invalid expression before any searching starts
+            self.regex = re.compile(text, 0 if case_sensitive else re.IGNORECASE)
+
+    def cancel(self):
+        """Stop a search running with this query on another thread."""
+        self.cancelled = True
+
+    def literals(self) -> list[str]:
+        """Substrings that any matching payload contains, used to narrow candidates."""
+        if self.mode == SUBSTRING:
+            return [self.text]
+        if self.mode == REGEX:
+            return regex_literals(self.text)
+        return [literal for literal in [self.value, *self.path] if literal]
+
+    def matches(self, payload: bytes) -> bool:
+        if self.mode == SUBSTRING:
+            needle = self.text.encode("utf-8")
+            if self.case_sensitive:
+                return needle in payload
+            return needle.lower() in payload.lower()
+        if self.mode == REGEX:
+            return self.regex.search(payload.decode("utf-8", errors="replace")) is not None
+        if self._raw_value is not None and self._raw_value not in payload.lower():
+            return False
+        found, value = json_field(payload, self.path)
+        if not found or self.value is None:
+            return found
+        text = value if isinstance(value, str) else json.dumps(value)
+        if self.case_sensitive:
+            return text == self.value
+        return text.lower() == self.value.lower()
+
+
+class SearchIndex:
+    """Trigram inverted index over the most recent ``max_documents`` messages, holding at
+    most ``max_bytes`` of their payloads.
+
+    Batches handed to ``add_batch`` are indexed on a worker thread; if it falls
+    ``MAX_PENDING_BATCHES`` behind, further batches are skipped and counted rather than
+    slowing the caller. Postings are ascending ``array('I')`` ids of blocks of 32
+    consecutive messages, over the lowercased first ``INDEX_BYTES`` of each payload, so
+    trigrams repeated across similar messages cost one entry per block. A query intersects
+    the postings of its literals' trigrams and verifies only the messages of those blocks,
+    newest first.
+    """
+
+    def __init__(
+        self, max_documents: int = DEFAULT_MAX_DOCUMENTS, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.max_documents = max_documents
+        self.max_bytes = max_bytes
+        self.nbytes = 0  # Payload bytes of the searchable messages
+        self.skipped = 0
+
+        self._lock = threading.Lock()
+        self._postings: dict[bytes, array] = {}
+        self._long_blocks = array("I")
+        self._channel_ids: dict[str, int] = {}
+        self._channel_names: list[str] = []
+        self._channels = array("I")
+        self._timestamps = array("d")
+        self._payloads: list[bytes] = []
+        self._first_document = 0
+        self._next_document = 0
+        self._compacted_at = 0
+
+        self._queue: queue.Queue[list[Message]] = queue.Queue(MAX_PENDING_BATCHES)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def document_count(self) -> int:
+        return self._next_document - self._first_document
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def add_batch(self, batch: list[Message]):
+        """Queue a batch for indexing; safe to call from any thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="search-index", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            self.skipped += len(batch)
+
+    def index_batch(self, batch: list[Message]):
+        """Index a batch on the calling thread."""
+        with self._lock:
+            for channel_name, payload, timestamp in batch:
+                self._index(channel_name, payload, timestamp)
+            aged = self._first_document - self._compacted_at
+            # Aging out by size can leave most postings stale long before half the documents
+            if aged >= self.max_documents // 2 or aged > self.document_count:
+                self._compact()
+
+    def search(self, query: SearchQuery) -> list[Message]:
+        """Matching messages, newest first, at most ``query.limit`` of them.
+
+        Candidates are verified ``VERIFY_CHUNK`` at a time and the lock is released in
+        between, so indexing carries on through a long scan; messages that age out meanwhile
+        are skipped. Meant for a worker thread, which ``query.cancel()`` stops early.
+        """
+        results: list[Message] = []
+        channel_matches: dict[int, bool] = {}
+        with self._lock:
+            candidates = self._candidates(query)
+        while not query.cancelled and len(results) < query.limit:
+            with self._lock:
+                chunk = list(itertools.islice(candidates, VERIFY_CHUNK))
+                self._verify(query, chunk, channel_matches, results)
+            if len(chunk) < VERIFY_CHUNK:
+                break
+            time.sleep(0)
+        return results[: query.limit]
+
+    def _verify(
+        self,
+        query: SearchQuery,
+        documents: list[int],
+        channel_matches: dict[int, bool],
+        results: list[Message],
+    ):
+        for document in documents:
+            if document < self._first_document:
+                continue
+            position = document % self.max_documents
+            timestamp = self._timestamps[position]
+            if query.since is not None and timestamp < query.since:
+                continue
+            if query.until is not None and timestamp > query.until:
+                continue
+            channel_id = self._channels[position]
+            matched = channel_matches.get(channel_id)
+            if matched is None:
+                channel_name = self._channel_names[channel_id]
+                matched = channel_matches[channel_id] = fnmatchcase(
+                    channel_name, query.channel_glob
+                )
+            if not matched:
+                continue
+            payload = self._payloads[position]
+            if query.matches(payload):
+                results.append((self._channel_names[channel_id], payload, timestamp))
+                if len(results) >= query.limit:
+                    return
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            del self._long_blocks[:]
+            self._channel_ids.clear()
+            self._channel_names.clear()
+            del self._channels[:]
+            del self._timestamps[:]
+            self._payloads.clear()
+            self.nbytes = 0
+            self._first_document = self._next_document = self._compacted_at = 0
+            self.skipped = 0
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            for start in range(0, len(batch), INDEX_CHUNK):
+                self.index_batch(batch[start : start + INDEX_CHUNK])
+                # Hand the GIL back so indexing does not stall the GUI thread
+                time.sleep(0)
+
+    def _index(self, channel_name: str, payload: bytes, timestamp: float):
+        channel_id = self._channel_ids.get(channel_name)
+        if channel_id is None:
+            channel_id = self._channel_ids[channel_name] = len(self._channel_names)
+            self._channel_names.append(channel_name)
+
+        document = self._next_document
+        if len(self._payloads) < self.max_documents:
+            self._channels.append(channel_id)
+            self._timestamps.append(timestamp)
+            self._payloads.append(payload)
+        else:
+            position = document % self.max_documents
+            self._channels[position] = channel_id
+            self._timestamps[position] = timestamp
+            # Empty if the message it replaces already aged out by size
+            self.nbytes -= len(self._payloads[position])
+            self._payloads[position] = payload
+            self._first_document = max(self._first_document, document - self.max_documents + 1)
+        self._next_document += 1
+        self.nbytes += len(payload)
+        while self.nbytes > self.max_bytes and self._first_document < document:
+            # Age out the oldest payloads; their postings go with the next compaction
+            position = self._first_document % self.max_documents
+            self.nbytes -= len(self._payloads[position])
+            self._payloads[position] = b""
+            self._first_document += 1
+
+        block = document >> BLOCK_BITS
+        postings = self._postings
+        for trigram in _trigrams(payload[:INDEX_BYTES].lower()):
+            blocks = postings.get(trigram)
+            if blocks is None:
+                blocks = postings[trigram] = array("I")
+            if not blocks or blocks[-1] != block:
+                blocks.append(block)
+        long_blocks = self._long_blocks
+        if len(payload) > INDEX_BYTES and (not long_blocks or long_blocks[-1] != block):
+            long_blocks.append(block)
+
+    def _compact(self):
+        """Drop postings of blocks that have aged out entirely."""
+        first_block = self._first_document >> BLOCK_BITS
+        for trigram, blocks in list(self._postings.items()):
+            start = bisect_left(blocks, first_block)
+            if start == len(blocks):
+                del self._postings[trigram]
+            elif start:
+                del blocks[:start]
+        del self._long_blocks[: bisect_left(self._long_blocks, first_block)]
+        self._compacted_at = self._first_document
+
+    def _candidates(self, query: SearchQuery) -> Iterator[int]:
+        """Document ids that may match, newest first."""
+        first, end = self._time_range(query.since, query.until)
+        trigrams: set[bytes] = set()
+        for literal in query.literals():
+            trigrams |= _trigrams(literal.encode("utf-8").lower())
+        if not trigrams:
+            return iter(range(end - 1, first - 1, -1))
+
+        first_block = first >> BLOCK_BITS
+        postings = sorted((self._postings.get(trigram, _EMPTY) for trigram in trigrams), key=len)
+        blocks: list[int] = postings[0][bisect_left(postings[0], first_block) :].tolist()
+        for other in postings[1:]:
+            if not blocks:
+                break
+            if len(blocks) * 16 < len(other):
+                blocks = [block for block in blocks if _contains(other, block)]
+            else:
+                blocks = sorted(set(blocks).intersection(other))
+        # Payloads longer than the indexed prefix may match beyond it
+        long_blocks = self._long_blocks[bisect_left(self._long_blocks, first_block) :]
+        if long_blocks:
+            blocks = sorted(set(blocks).union(long_blocks))
+        return self._documents_of(blocks, first, end)
+
+    def _time_range(self, since: Optional[float], until: Optional[float]) -> tuple[int, int]:
+        """Document ids [first, end) received within the time range.
+
+        Messages are stamped on arrival, so timestamps ascend with document ids and the
+        bounds can be found by bisection.
+        """
+        first, end = self._first_document, self._next_document
+        if since is not None:
+            first = self._bisect_time(since, first, end)
+        if until is not None:
+            end = self._bisect_time(until, first, end, after=True)
+        return first, end
+
+    def _bisect_time(self, timestamp: float, low: int, high: int, after: bool = False) -> int:
+        timestamps = self._timestamps
+        while low < high:
+            middle = (low + high) // 2
+            value = timestamps[middle % self.max_documents]
+            if value < timestamp or (after and value == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _documents_of(self, blocks: list[int], first: int, end: int) -> Iterator[int]:
+        last = end - 1
+        for block in reversed(blocks):
+            start = max(block << BLOCK_BITS, first)
+            end = min(((block + 1) << BLOCK_BITS) - 1, last)
+            yield from range(end, start - 1, -1)
+
+
+def _contains(values: array, value: int) -> bool:
+    index = bisect_left(values, value)
+    return index < len(values) and values[index] == value
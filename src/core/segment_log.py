@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import itertools
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Callable, Iterable, Iterator, Optional
+
+from .messages import Message
+
+
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024  # Size of each memory-mapped segment file
+MAX_OPEN_SEGMENTS = 16  # Read-only mappings of full segments kept open at once
+
+RECORD_HEADER = struct.Struct("<dII")  # timestamp, channel id, payload length
+OFFSET_BITS = 40  # A location packs (segment << OFFSET_BITS) | offset into one integer
+OFFSET_MASK = (1 << OFFSET_BITS) - 1
+
+
+class SegmentLog:
+    """Append-only message log in memory-mapped segment files.
+
+    Records are written into the mapping of the current segment; once it is full it is
+    closed and reopened read-only on demand, so resident memory is the current segment
+    plus the pages actually read. Each channel keeps an ``array('Q')`` of record
+    locations, 8 bytes per message, and reading a message touches only its record.
+
+    Appends come from one thread; reads may come from others, e.g. an export writer.
+    Without a ``directory`` the log lives in a temporary directory removed by ``close``.
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, segment_bytes: int = DEFAULT_SEGMENT_BYTES
+    ):
+        self.temporary = directory is None
+        self.directory = tempfile.mkdtemp(prefix="red-moon-") if directory is None else directory
+        os.makedirs(self.directory, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.nbytes = 0
+
+        self._channel_ids: dict[str, int] = {}
+        self._locations: list[array] = []
+        self._segment_paths: list[str] = []
+        self._segment_sizes: list[int] = []
+        self._writer: Optional[mmap.mmap] = None
+        self._write_offset = 0
+        self._readers: OrderedDict[int, mmap.mmap] = OrderedDict()
+        # Guards mappings against being closed or replaced while another thread reads
+        self._lock = threading.Lock()
+
+    def __contains__(self, channel_name: str) -> bool:
+        return channel_name in self._channel_ids
+
+    def get(self, channel_name: str) -> Optional["ChannelLog"]:
+        channel_id = self._channel_ids.get(channel_name)
+        return None if channel_id is None else ChannelLog(self, self._locations[channel_id])
+
+    def append(self, channel_name: str, payload: bytes, timestamp: float):
+        channel_id = self._channel_ids.get(channel_name)
+        if channel_id is None:
+            channel_id = self._channel_ids[channel_name] = len(self._locations)
+            self._locations.append(array("Q"))
+
+        size = RECORD_HEADER.size + len(payload)
+        writer = self._writer
+        if writer is None or self._write_offset + size > len(writer):
+            writer = self._open_segment(size)
+        offset = self._write_offset
+        RECORD_HEADER.pack_into(writer, offset, timestamp, channel_id, len(payload))
+        writer[offset + RECORD_HEADER.size : offset + size] = payload
+        self._write_offset += size
+        self._segment_sizes[-1] = self._write_offset
+        self.nbytes += size
+        self._locations[channel_id].append(
+            (len(self._segment_paths) - 1) << OFFSET_BITS | offset
+        )
+
+    def append_batch(self, messages: Iterable[Message]):
+        append = self.append
+        for channel_name, payload, timestamp in messages:
+            append(channel_name, payload, timestamp)
+
+    def read(self, location: int) -> tuple[float, bytes]:
+        segment = location >> OFFSET_BITS
+        offset = location & OFFSET_MASK
+        with self._lock:
+            if segment == len(self._segment_paths) - 1 and self._writer is not None:
+                view = self._writer
+            else:
+                view = self._reader(segment)
+            timestamp, _, length = RECORD_HEADER.unpack_from(view, offset)
+            start = offset + RECORD_HEADER.size
+            return timestamp, view[start : start + length]
+
+    def clear(self):
+        self._close_maps()
+        for path in self._segment_paths:
+            os.remove(path)
+        self._segment_paths.clear()
+        self._segment_sizes.clear()
+        self._channel_ids.clear()
+        self._locations.clear()
+        self.nbytes = 0
+
+    def close(self):
+        self._close_maps()
+        if self.temporary:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _open_segment(self, record_size: int) -> mmap.mmap:
+        path = os.path.join(self.directory, f"{len(self._segment_paths):08d}.seg")
+        # A record larger than a segment gets a segment of its own
+        size = max(self.segment_bytes, record_size)
+        with open(path, "w+b") as file:
+            file.truncate(size)
+            writer = mmap.mmap(file.fileno(), size)
+        with self._lock:
+            self._seal()
+            self._writer = writer
+            self._segment_paths.append(path)
+            self._segment_sizes.append(0)
+            self._write_offset = 0
+        return writer
+
+    def _seal(self):
+        """Close the writable mapping and trim the file to the records it holds."""
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        os.truncate(self._segment_paths[-1], self._segment_sizes[-1])
+
+    def _reader(self, segment: int) -> mmap.mmap:
+        reader = self._readers.get(segment)
+        if reader is not None:
+            self._readers.move_to_end(segment)
+            return reader
+        with open(self._segment_paths[segment], "rb") as file:
+            reader = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._readers[segment] = reader
+        if len(self._readers) > MAX_OPEN_SEGMENTS:
+            self._readers.popitem(last=False)[1].close()
+        return reader
+
+    def _close_maps(self):
+        with self._lock:
+            self._seal()
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+
+
+class ChannelLog:
+    """One channel's messages in a ``SegmentLog``, read like a ``MessageBuffer`` that never
+    evicts: sequence numbers start at 1 and every message stays readable.
+    """
+
+    __slots__ = ("log", "_locations")
+
+    def __init__(self, log: SegmentLog, locations: array):
+        self.log = log
+        self._locations = locations
+
+    def __len__(self):
+        return len(self._locations)
+
+    @property
+    def first_seq(self) -> int:
+        return 1
+
+    @property
+    def total(self) -> int:
+        return len(self._locations)
+
+    def get(self, index: int) -> tuple[int, float, bytes]:
+        timestamp, payload = self.log.read(self._locations[index])
+        return index + 1, timestamp, payload
+
+    def tail(self, count: int) -> Iterator[tuple[int, float, bytes]]:
+        size = len(self._locations)
+        for index in range(max(size - count, 0), size):
+            yield self.get(index)
+
+    def __iter__(self):
+        return self.tail(len(self._locations))
+
+    def snapshot(self) -> tuple[Iterator[float], Iterator[bytes]]:
+        """Timestamps and payloads up to the current message, read lazily from disk.
+
+        Both come from one pass over the records, so iterate them in step, e.g. with ``zip``.
+        """
+        count = len(self._locations)
+        records = (self.log.read(self._locations[index]) for index in range(count))
+        timestamps, payloads = itertools.tee(records)
+        return (timestamp for timestamp, _ in timestamps), (payload for _, payload in payloads)
+
+
+class LogSeeder:
+    """Copies snapshots of the in-memory history into a new ``SegmentLog`` on a thread.
+
+    Only the seeding thread appends to ``log`` until ``on_seeded`` is called with the
+    seeder; messages arriving meanwhile are collected in ``backlog`` by the owner, who
+    appends them once seeding is done so the log keeps arrival order.
+    """
+
+    def __init__(
+        self,
+        snapshots: list[tuple[str, list[float], list[bytes]]],
+        on_seeded: Callable[["LogSeeder"], None],
+    ):
+        self.log = SegmentLog()
+        self.backlog: list[Message] = []
+        self._snapshots = snapshots
+        self._on_seeded = on_seeded
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-seeder", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        """Stop seeding and remove the log once the thread has let go of it."""
+        self._stopping.set()
+        self._thread.join()
+        self.log.close()
+
+    def _run(self):
+        append = self.log.append
+        for channel_name, timestamps, payloads in self._snapshots:
+            if self._stopping.is_set():
+                return
+            for payload, timestamp in zip(payloads, timestamps):
+                append(channel_name, payload, timestamp)
+        self._snapshots = []
+        self._on_seeded(self)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from array import array
+from typing import Generic, Hashable, TypeVar
+
+
+DEFAULT_WIDTH = 4096  # Counters per Count-Min row
+DEFAULT_DEPTH = 4  # Count-Min rows, each indexed by a different hash
+DEFAULT_TOP = 100  # Items a TopK keeps
+
+_Item = TypeVar("_Item", bound=Hashable)
+
+
+class CountMinSketch:
+    """Approximate counts in fixed memory: ``depth`` rows of ``width`` counters.
+
+    An estimate never undercounts, and overcounts by at most ``2 * total / width`` with
+    probability ``1 - 2 ** -depth``. Row indexes come from one hash per item, combined as
+    ``h1 + row * h2`` (Kirsch-Mitzenmacher), so an update costs a single ``hash`` call.
+    """
+
+    def __init__(self, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def add(self, item: Hashable, count: int = 1) -> int:
+        """Count ``item`` and return its new estimate."""
+        self.total += count
+        value = hash(item)
+        step = (value >> 32) | 1
+        width = self.width
+        estimate = -1  # Counters are unsigned, so any row replaces this
+        for row in self._rows:
+            index = value % width
+            row[index] += count
+            if estimate < 0 or row[index] < estimate:
+                estimate = row[index]
+            value += step
+        return estimate
+
+    def estimate(self, item: Hashable) -> int:
+        value = hash(item)
+        step = (value >> 32) | 1
+        width = self.width
+        estimate = -1
+        for row in self._rows:
+            count = row[value % width]
+            if estimate < 0 or count < estimate:
+                estimate = count
+            value += step
+        return estimate
+
+    def clear(self):
+        self.total = 0
+        for row in self._rows:
+            row[:] = array("Q", bytes(8 * self.width))
+
+
+class TopK(Generic[_Item]):
+    """The ``k`` most frequent items of a stream, counted by a ``CountMinSketch``.
+
+    Every item is counted in the sketch; a table holds the current top ``k`` with their
+    estimates. A new item only displaces the smallest entry once its estimate exceeds
+    it, so the table is scanned for its minimum only on such displacements, which are
+    rare once the heavy hitters have been found.
+    """
+
+    def __init__(
+        self, k: int = DEFAULT_TOP, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH
+    ):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self._table: dict[_Item, int] = {}
+        self._minimum = 0
+
+    @property
+    def total(self) -> int:
+        return self.sketch.total
+
+    def update(self, counts: dict[_Item, int]):
+        """Add a batch of pre-aggregated counts, e.g. a ``collections.Counter``."""
+        add = self.sketch.add
+        table = self._table
+        for item, count in counts.items():
+            estimate = add(item, count)
+            if item in table:
+                table[item] = estimate
+            elif len(table) < self.k:
+                table[item] = estimate
+                if len(table) == self.k:
+                    self._minimum = min(table.values())
+            elif estimate > self._minimum:
+                # The recorded minimum may be stale (entries only grow), so look it up
+                smallest = min(table, key=table.__getitem__)
+                if estimate > table[smallest]:
+                    del table[smallest]
+                    table[item] = estimate
+                self._minimum = min(table.values())
+
+    def top(self, count: int | None = None) -> list[tuple[_Item, int]]:
+        """``(item, estimated count)`` pairs, most frequent first."""
+        ranked = sorted(self._table.items(), key=lambda entry: entry[1], reverse=True)
+        return ranked[:count] if count is not None else ranked
+
+    def estimate(self, item: _Item) -> int:
+        return self.sketch.estimate(item)
+
+    def clear(self):
+        self.sketch.clear()
+        self._table.clear()
+        self._minimum = 0
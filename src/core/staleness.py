@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import heapq
+import queue
+import threading
+from fnmatch import fnmatchcase
+from typing import Callable, Optional
+
+from .connection import StatusCallback, StatusReporter
+
+
+DEFAULT_THRESHOLD = 60.0  # Seconds of silence before a channel is reported
+MAX_LISTED_CHANNELS = 5  # Channel names spelled out in one aggregated notification
+
+Rule = tuple[str, float]
+
+
+def parse_rules(text: str) -> list[Rule]:
+    """Parse ``<glob> <seconds>`` lines; blank lines and ``#`` comments are skipped.
+
+    A threshold of 0 never reports the matching channels.
+    """
+    rules = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        pattern, _, seconds = line.rpartition(" ")
+        try:
+            threshold = float(seconds)
+        except ValueError:
+            threshold = -1.0
+        if not pattern.strip() or threshold < 0:
+            raise ValueError(f"Line {number}: expected '<channel glob> <seconds>', got {line!r}")
+        rules.append((pattern.strip(), threshold))
+    return rules
+
+
+def format_rules(rules: list[Rule]) -> str:
+    return "\n".join(f"{pattern} {threshold:g}" for pattern, threshold in rules)
+
+
+class StaleDetector:
+    """Finds channels that have been silent longer than their threshold.
+
+    Deadlines live in a min-heap with at most one entry per channel. Messages only update
+    the last-seen time; an entry whose channel spoke since it was pushed is re-pushed
+    with its real deadline when it reaches the top. A check therefore only looks at
+    channels whose deadline has passed, and each silent channel is reported once until
+    it speaks again.
+
+    Thresholds come from the first matching ``(glob, seconds)`` rule, else the default,
+    and are cached per channel.
+    """
+
+    def __init__(self, rules: Optional[list[Rule]] = None, default: float = DEFAULT_THRESHOLD):
+        self.rules = list(rules or [])
+        self.default = default
+        self._last_seen: dict[str, float] = {}
+        self._thresholds: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._scheduled: set[str] = set()
+        self._silent: set[str] = set()
+
+    @property
+    def silent_count(self) -> int:
+        return len(self._silent)
+
+    def threshold(self, channel_name: str) -> float:
+        threshold = self._thresholds.get(channel_name)
+        if threshold is None:
+            threshold = self.default
+            for pattern, rule_threshold in self.rules:
+                if fnmatchcase(channel_name, pattern):
+                    threshold = rule_threshold
+                    break
+            self._thresholds[channel_name] = threshold
+        return threshold
+
+    def touch(self, channel_name: str, timestamp: float):
+        self._last_seen[channel_name] = timestamp
+        self._silent.discard(channel_name)
+        if channel_name not in self._scheduled:
+            self._schedule(channel_name, timestamp)
+
+    def expired(self, now: float) -> list[str]:
+        """Channels that went silent since the previous call."""
+        heap = self._heap
+        expired = []
+        while heap and heap[0][0] <= now:
+            _, channel_name = heapq.heappop(heap)
+            self._scheduled.discard(channel_name)
+            last_seen = self._last_seen[channel_name]
+            if last_seen + self.threshold(channel_name) > now:
+                self._schedule(channel_name, last_seen)
+            else:
+                self._silent.add(channel_name)
+                expired.append(channel_name)
+        return expired
+
+    def set_rules(self, rules: list[Rule], default: Optional[float] = None):
+        self.rules = list(rules)
+        if default is not None:
+            self.default = default
+        self._thresholds.clear()
+        self._heap.clear()
+        self._scheduled.clear()
+        for channel_name, last_seen in self._last_seen.items():
+            if channel_name not in self._silent:
+                self._schedule(channel_name, last_seen)
+
+    def clear(self):
+        self._last_seen.clear()
+        self._thresholds.clear()
+        self._heap.clear()
+        self._scheduled.clear()
+        self._silent.clear()
+
+    def _schedule(self, channel_name: str, last_seen: float):
+        threshold = self.threshold(channel_name)
+        if threshold > 0:
+            heapq.heappush(self._heap, (last_seen + threshold, channel_name))
+            self._scheduled.add(channel_name)
+
+
+def silence_message(channel_names: list[str], threshold: float) -> str:
+    """One notification text for any number of newly silent channels."""
+    if len(channel_names) == 1:
+        return f"No data received for channel '{channel_names[0]}' in the last {threshold:g}s."
+    listed = ", ".join(channel_names[:MAX_LISTED_CHANNELS])
+    more = len(channel_names) - MAX_LISTED_CHANNELS
+    if more > 0:
+        listed = f"{listed} and {more} more"
+    return f"{len(channel_names)} channels silent: {listed}"
+
+
+class NotificationWorker:
+    """Delivers notifications from a daemon thread so a slow desktop service never blocks
+    the caller. Notifications posted while one is being shown are delivered in order.
+    Failures to deliver go to ``on_status``.
+    """
+
+    def __init__(
+        self, send: Callable[[str, str], None], on_status: Optional[StatusCallback] = None
+    ):
+        self.send = send
+        self.status = StatusReporter(on_status)
+        self._queue: queue.Queue[Optional[tuple[str, str]]] = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def post(self, title: str, message: str):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="notifications", daemon=True)
+            self._thread.start()
+        self._queue.put((title, message))
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self.send(*item)
+            except Exception as error:  # A broken notification backend must not kill the worker
+                self.status.report(f"Notification failed: {error}")
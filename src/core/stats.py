@@ -0,0 +1,209 @@
+"""Server-side statistics polled alongside the subscription.
+
+``StatsPoller`` pipelines INFO, PUBSUB NUMPAT/NUMSUB, CLIENT LIST and SLOWLOG on a worker
+thread every few seconds and keeps numeric results in ``StatsHistory`` rings, so server
+load and output-buffer growth can be lined up against the traffic the monitor receives.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from array import array
+from typing import Callable, Optional
+
+import redis
+from redis.exceptions import RedisError
+
+from .connection import Backoff, StatusCallback, StatusReporter, get_pool
+from .decoding import decode_text
+
+
+DEFAULT_INTERVAL = 2.0  # Seconds between polls
+HISTORY_POINTS = 900  # Samples kept per series, 30 minutes at the default interval
+MAX_NUMSUB_CHANNELS = 100  # Channels whose subscriber counts are asked for per poll
+SLOWLOG_ENTRIES = 32  # Slow log entries fetched per poll
+TOP_CLIENTS = 20  # Clients with the largest output buffers kept per poll
+
+# Series name -> (INFO field, label); series without a field are derived by the poller
+SERIES = {
+    "ops_per_sec": ("instantaneous_ops_per_sec", "Ops/s"),
+    "output_kbps": ("instantaneous_output_kbps", "Output KB/s"),
+    "connected_clients": ("connected_clients", "Clients"),
+    "used_memory": ("used_memory", "Memory"),
+    "pubsub_channels": ("pubsub_channels", "Pub/sub channels"),
+    "pubsub_patterns": ("pubsub_patterns", "Pub/sub patterns"),
+    "pubsub_output_buffer": (None, "Pub/sub output buffers"),
+    "max_output_buffer": (None, "Largest output buffer"),
+    "slow_commands": (None, "Slow commands"),
+    "monitor_rate": (None, "Monitor msg/s"),
+}
+
+
+class StatsHistory:
+    """Fixed-size rings of samples; every series shares one ring of timestamps.
+
+    Each point costs 8 bytes per series. Values missing from a sample are stored as NaN.
+    """
+
+    def __init__(self, names: list[str], points: int = HISTORY_POINTS):
+        self.points = points
+        self.count = 0
+        self._timestamps = array("d", bytes(8 * points))
+        self._series = {name: array("d", bytes(8 * points)) for name in names}
+        self._lock = threading.Lock()
+
+    def append(self, timestamp: float, values: dict[str, float]):
+        with self._lock:
+            position = self.count % self.points
+            self._timestamps[position] = timestamp
+            for name, series in self._series.items():
+                series[position] = values.get(name, math.nan)
+            self.count += 1
+
+    def timestamps(self) -> list[float]:
+        with self._lock:
+            return self._ordered(self._timestamps)
+
+    def values(self, name: str) -> list[float]:
+        """Samples of one series, oldest first."""
+        with self._lock:
+            return self._ordered(self._series[name])
+
+    def latest(self, name: str) -> float:
+        with self._lock:
+            if not self.count:
+                return math.nan
+            return self._series[name][(self.count - 1) % self.points]
+
+    def clear(self):
+        with self._lock:
+            self.count = 0
+
+    def _ordered(self, ring: array) -> list[float]:
+        if self.count <= self.points:
+            return ring[: self.count].tolist()
+        start = self.count % self.points
+        return ring[start:].tolist() + ring[:start].tolist()
+
+
+class StatsPoller:
+    """Polls one server's statistics on a daemon thread until ``stop``.
+
+    All commands of a poll go out in one non-transactional pipeline on the shared pool.
+    A command the server refuses, e.g. CLIENT LIST under a restrictive ACL, only leaves
+    its part of the sample empty. ``channels`` may be reassigned from another thread to
+    choose which channels get subscriber counts; ``received`` returns the monitor's
+    running message count, recorded as the ``monitor_rate`` series.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        interval: float = DEFAULT_INTERVAL,
+        points: int = HISTORY_POINTS,
+        received: Optional[Callable[[], int]] = None,
+        on_status: Optional[StatusCallback] = None,
+    ):
+        self.redis_url = redis_url
+        self.interval = interval
+        self.received = received
+        self.status = StatusReporter(on_status)
+        self.backoff = Backoff()
+        self.pool = get_pool(redis_url)
+        self.history = StatsHistory(list(SERIES), points)
+        self.channels: list[str] = []
+        # Latest non-numeric results, replaced whole on every poll
+        self.subscribers: list[tuple[str, int]] = []
+        self.clients: list[dict] = []
+        self.slowlog: list[dict] = []
+        self.error: Optional[str] = None
+
+        self._last_slowlog_id = -1
+        self._last_received: Optional[tuple[float, int]] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stats-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+
+    def poll(self):
+        """Take one sample on the calling thread."""
+        channels = self.channels[:MAX_NUMSUB_CHANNELS]
+        pipeline = redis.Redis(connection_pool=self.pool).pipeline(transaction=False)
+        pipeline.info()
+        pipeline.pubsub_numpat()
+        pipeline.pubsub_numsub(*channels)
+        pipeline.client_list()
+        pipeline.slowlog_get(SLOWLOG_ENTRIES)
+        info, _, numsub, clients, slowlog = pipeline.execute(raise_on_error=False)
+        if isinstance(info, Exception):
+            raise info
+
+        now = time.time()
+        values: dict[str, float] = {}
+        for name, (field, _) in SERIES.items():
+            if field is not None and isinstance(info.get(field), (int, float)):
+                values[name] = float(info[field])
+
+        if not isinstance(numsub, Exception):
+            self.subscribers = [(decode_text(channel), count) for channel, count in numsub]
+
+        if not isinstance(clients, Exception):
+            buffers = [(int(client.get("omem", 0)), client) for client in clients]
+            values["pubsub_output_buffer"] = float(
+                sum(omem for omem, client in buffers if _is_subscriber(client))
+            )
+            values["max_output_buffer"] = float(max((omem for omem, _ in buffers), default=0))
+            buffers.sort(key=lambda entry: entry[0], reverse=True)
+            self.clients = [client for _, client in buffers[:TOP_CLIENTS]]
+
+        if not isinstance(slowlog, Exception):
+            newest = max((entry["id"] for entry in slowlog), default=self._last_slowlog_id)
+            if self._last_slowlog_id >= 0:
+                values["slow_commands"] = float(
+                    sum(1 for entry in slowlog if entry["id"] > self._last_slowlog_id)
+                )
+            self._last_slowlog_id = newest
+            self.slowlog = slowlog
+
+        if self.received is not None:
+            received = self.received()
+            if self._last_received is not None:
+                last_time, last_received = self._last_received
+                # A restarted subscriber counts from zero again
+                if received >= last_received and now > last_time:
+                    values["monitor_rate"] = (received - last_received) / (now - last_time)
+            self._last_received = (now, received)
+
+        self.history.append(now, values)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            try:
+                self.poll()
+                self.error = None
+                delay = self.interval - (time.monotonic() - started)
+                if self.backoff.attempts:
+                    self.backoff.reset()
+            except RedisError as error:
+                self.error = str(error)
+                self.status.report(f"Server stats unavailable: {error}")
+                delay = max(self.backoff.next_delay(), self.interval)
+            except (KeyError, TypeError, ValueError) as error:
+                # A reply in an unexpected shape, e.g. from a proxy; try again next interval
+                self.error = f"Unexpected reply: {error!r}"
+                self.status.report(f"Server stats unavailable: {self.error}")
+                delay = self.interval - (time.monotonic() - started)
+            self._stopping.wait(max(delay, 0.0))
+
+
+def _is_subscriber(client: dict) -> bool:
+    subscriptions = int(client.get("sub") or 0) + int(client.get("psub") or 0)
+    return subscriptions > 0 or "P" in client.get("flags", "")
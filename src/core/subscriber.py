@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+import redis
+from redis.exceptions import (
+    ConnectionError as RedisConnectionError,
+    RedisError,
+    TimeoutError as RedisTimeoutError,
+)
+
+from .connection import Backoff, StatusCallback, StatusReporter, get_pool
+from .decoding import ChannelNames
+from .messages import BATCH_INTERVAL, BATCH_SIZE, SOURCE_SCHEMES, Message
+
+
+class Subscriber:
+    """Pattern subscription that delivers messages in time- and size-bounded batches.
+
+    Has no Qt dependency: iterate over ``batches()`` or pass a callback to ``run``.
+    Dropped connections are retried with exponential backoff on a connection pool shared by
+    every subscriber to the same URL, so stopping and restarting does not leak connections.
+    Payloads stay raw bytes; only channel names are decoded, once per distinct name.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        channel_pattern: str,
+        batch_interval: float = BATCH_INTERVAL,
+        batch_size: int = BATCH_SIZE,
+        on_status: Optional[StatusCallback] = None,
+    ):
+        self.redis_url = redis_url
+        self.channel_pattern = channel_pattern
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self.status = StatusReporter(on_status)
+        self.backoff = Backoff()
+        self.pool = get_pool(redis_url)
+        self.channel_names = ChannelNames()
+        self._stopping = threading.Event()
+
+    def run(self, on_batch: Callable[[list[Message]], None]):
+        for batch in self.batches():
+            on_batch(batch)
+
+    def batches(self) -> Iterator[list[Message]]:
+        to_message = self._message
+        stopping = self._stopping
+        while not stopping.is_set():
+            batch: list[Message] = []
+            pubsub = redis.Redis(connection_pool=self.pool).pubsub()
+            try:
+                pubsub.psubscribe(self.channel_pattern)
+                if self.backoff.attempts:
+                    self.backoff.reset()
+                    self.status.report("Monitoring")
+                deadline = time.monotonic() + self.batch_interval
+                # get_message never blocks longer than one batch interval, so stop() is
+                # noticed within that time
+                while not stopping.is_set():
+                    timeout = max(deadline - time.monotonic(), 0.0)
+                    message = pubsub.get_message(timeout=timeout)
+                    if message is not None and message["type"] == "pmessage":
+                        batch.append(to_message(message["channel"], message["data"]))
+
+                    if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                        if batch:
+                            yield batch
+                            batch = []
+                        deadline = time.monotonic() + self.batch_interval
+                if batch:
+                    yield batch
+            except (RedisTimeoutError, RedisConnectionError):
+                if batch:
+                    yield batch
+                self.status.report("Wait For Connection ...")
+                stopping.wait(self.backoff.next_delay())
+            except RedisError as error:
+                # Refused outright, e.g. NOPERM under an ACL; retrying would not help
+                if batch:
+                    yield batch
+                self.status.report(f"Subscription failed: {error}")
+                return
+            finally:
+                self._close(pubsub)
+
+    def _message(self, channel: bytes, data: bytes) -> Message:
+        return self.channel_names(channel), data, time.time()
+
+    def stop(self):
+        """Ask ``batches``/``run`` to unsubscribe and return; safe to call from any thread."""
+        self._stopping.set()
+
+    def _close(self, pubsub):
+        try:
+            if pubsub.subscribed:
+                pubsub.punsubscribe()
+        except (RedisTimeoutError, RedisConnectionError):
+            pass
+        pubsub.close()
+
+
+def create_subscriber(redis_urls: list[str], channel_patterns: list[str], **kwargs):
+    """Use a blocking Subscriber for one server and pattern, an AsyncSubscriber otherwise.
+
+    A single ``replay://`` or ``synthetic://`` URL replays a recording or generates load
+    instead of connecting to Redis.
+    """
+    if len(redis_urls) == 1 and redis_urls[0].startswith(SOURCE_SCHEMES):
+        from .replay import create_source
+
+        return create_source(redis_urls[0], channel_patterns, **kwargs)
+
+    if len(redis_urls) == 1 and len(channel_patterns) == 1:
+        return Subscriber(redis_urls[0], channel_patterns[0], **kwargs)
+
+    from .async_subscriber import AsyncSubscriber
+
+    return AsyncSubscriber(redis_urls, channel_patterns, **kwargs)
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import time
+from array import array
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush, QColor
+
+from core.metrics import ChannelMetrics
+
+
+CHANNEL_NAME_ROLE = Qt.ItemDataRole.UserRole
+HIGHLIGHT_STEPS = 16  # Number of distinct background shades between highlight and idle
+HIGHLIGHT_DURATION = 0.8  # Seconds a highlight takes to fade out
+MOVE_ROWS_LIMIT = 32  # Larger reorders are applied as one layout change instead of row moves
+MOVE_SHIFT_LIMIT = 4096  # Rows shifted by single moves before one layout change is cheaper
+RESORT_INTERVAL = 5.0  # Seconds between re-sorts by a column, which reads every channel
+
+NAME_COLUMN, RATE_COLUMN, BYTE_RATE_COLUMN, P50_COLUMN, P99_COLUMN = range(5)
+HEADERS = ["Channel", "Msg/s", "B/s", "p50", "p99"]
+
+
+def _blend(start: QColor, end: QColor, level: float) -> QColor:
+    return QColor(
+        int(end.red() + (start.red() - end.red()) * level),
+        int(end.green() + (start.green() - end.green()) * level),
+        int(end.blue() + (start.blue() - end.blue()) * level),
+    )
+
+
+def format_count(value: float) -> str:
+    for unit in ("", "k", "M"):
+        if value < 1000:
+            return f"{value:.1f}{unit}" if value < 100 else f"{value:.0f}{unit}"
+        value /= 1000
+    return f"{value:.0f}G"
+
+
+def format_interval(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 0.001:
+        return f"{seconds * 1_000_000:.0f} us"
+    if seconds < 1:
+        return f"{seconds * 1000:.1f} ms"
+    return f"{seconds:.1f} s"
+
+
+class ChannelListModel(QAbstractTableModel):
+    """Channel list backed by flat per-channel arrays.
+
+    Each channel owns a fixed slot in the storage arrays; the visible order is a list of
+    slots, so moving a channel to the top only shifts slot numbers and emits ``rowsMoved``;
+    large batches of moves are applied in one pass over the order and a single layout change.
+    A slot-to-row array answers row lookups; single moves patch the rows they shift, and a
+    full reorder marks it stale until the next lookup rebuilds it in one pass.
+
+    Highlights store only the time each channel was last hit; ``data`` derives the fade level
+    for the rows being painted from the time given to ``set_highlight_time``.
+
+    Rate and inter-arrival columns are read from ``ChannelMetrics`` for the visible rows only,
+    at the time of the last ``refresh_metrics``, which also re-sorts now and then.
+    """
+
+    def __init__(self, metrics: ChannelMetrics, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics
+        self.sort_column = -1
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        self._metrics_time = time.time()
+        self._sorted_at = 0.0
+        self._names: list[str] = []
+        self._last_update = array("d")
+        self._counts = array("Q")
+        self._dropped = array("Q")
+        self._highlighted_at = array("d")  # slot -> monotonic time of the last hit, 0 if none
+        self._highlight_time = 0.0
+        self.highlight_duration = HIGHLIGHT_DURATION
+        self._slots: dict[str, int] = {}
+        self._order: list[int] = []
+        self._rows = array("q")  # slot -> row, valid unless _rows_stale
+        self._rows_stale = False
+
+        start_color = QColor("yellow")
+        end_color = QColor("white")
+        self._brushes = [
+            QBrush(_blend(start_color, end_color, step / HIGHLIGHT_STEPS))
+            for step in range(HIGHLIGHT_STEPS + 1)
+        ]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        slot = self._order[index.row()]
+        column = index.column()
+        if role == CHANNEL_NAME_ROLE or (role == Qt.DisplayRole and column == NAME_COLUMN):
+            return self._names[slot]
+        if role == Qt.DisplayRole:
+            return self._metric_text(self._names[slot], column)
+        if role == Qt.TextAlignmentRole and column != NAME_COLUMN:
+            return Qt.AlignRight | Qt.AlignVCenter
+        if role == Qt.BackgroundRole:
+            return self._highlight_brush(slot)
+        if role == Qt.ToolTipRole:
+            last_update = time.strftime("%H:%M:%S", time.localtime(self._last_update[slot]))
+            dropped = self._dropped[slot]
+            dropped_text = f", {dropped} dropped" if dropped else ""
+            return f"{self._counts[slot]} messages{dropped_text}, last update {last_update}"
+        return None
+
+    def channel_name(self, index: QModelIndex) -> str:
+        return self._names[self._order[index.row()]]
+
+    @property
+    def is_sorted(self) -> bool:
+        return self.sort_column >= 0
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort by a column; column -1 keeps the current order and stops re-sorting."""
+        self.sort_column = column
+        self.sort_order = order
+        self._apply_sort()
+
+    def refresh_metrics(self, now: float):
+        """Take a new metrics snapshot time and repaint the metric columns."""
+        self._metrics_time = now
+        if not self._order:
+            return
+        if now - self._sorted_at >= RESORT_INTERVAL:
+            self._apply_sort()
+        self.dataChanged.emit(
+            self.index(0, RATE_COLUMN),
+            self.index(len(self._order) - 1, P99_COLUMN),
+            [Qt.ItemDataRole.DisplayRole],
+        )
+
+    def row_of(self, channel_name: str) -> int:
+        slot = self._slots.get(channel_name)
+        if slot is None:
+            return -1
+        return self._row_of_slot(slot)
+
+    def touch(self, channel_name: str, timestamp: float, count: int = 1) -> bool:
+        """Record messages for a channel, appending it if unseen. Returns True if new."""
+        slot = self._slots.get(channel_name)
+        if slot is not None:
+            self._last_update[slot] = timestamp
+            self._counts[slot] += count
+            return False
+
+        slot = len(self._names)
+        row = len(self._order)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._names.append(channel_name)
+        self._last_update.append(timestamp)
+        self._counts.append(count)
+        self._dropped.append(0)
+        self._highlighted_at.append(0.0)
+        self._slots[channel_name] = slot
+        self._order.append(slot)
+        self._rows.append(row)
+        self.endInsertRows()
+        return True
+
+    def add_dropped(self, dropped: dict[str, int], timestamp: float):
+        """Count messages the overload policy discarded, adding channels seen only that way."""
+        for channel_name, count in dropped.items():
+            self.touch(channel_name, timestamp, 0)
+            self._dropped[self._slots[channel_name]] += count
+
+    def move_to_top(self, channel_name: str):
+        slot = self._slots.get(channel_name)
+        if slot is not None:
+            self._move_slot_to_top(slot)
+
+    def move_many_to_top(self, channel_names: list[str]):
+        """Move channels to the top so the last name given ends up first."""
+        slots = [self._slots[name] for name in channel_names if name in self._slots]
+        if len(slots) <= MOVE_ROWS_LIMIT:
+            # Each single move shifts every row above the moved one
+            shifted = sum(self._row_of_slot(slot) for slot in slots)
+            if shifted <= MOVE_SHIFT_LIMIT:
+                for slot in slots:
+                    self._move_slot_to_top(slot)
+                return
+
+        slots.reverse()
+        moved = set(slots)
+        self._set_order(slots + [slot for slot in self._order if slot not in moved])
+
+    def highlight(self, channel_name: str, now: float):
+        """Restart the fade of a channel; it is repainted with the next ``set_highlight_time``."""
+        slot = self._slots.get(channel_name)
+        if slot is not None:
+            self._highlighted_at[slot] = now
+            self._highlight_time = max(self._highlight_time, now)
+
+    def set_highlight_time(self, now: float):
+        """Fade levels painted from now on are those at ``now``."""
+        self._highlight_time = now
+
+    def clear(self):
+        self.beginResetModel()
+        self._names.clear()
+        del self._last_update[:]
+        del self._counts[:]
+        del self._dropped[:]
+        del self._highlighted_at[:]
+        self._slots.clear()
+        self._order.clear()
+        del self._rows[:]
+        self._rows_stale = False
+        self.endResetModel()
+
+    def _highlight_brush(self, slot: int) -> QBrush | None:
+        started = self._highlighted_at[slot]
+        if not started:
+            return None
+        level = 1.0 - (self._highlight_time - started) / self.highlight_duration
+        if level <= 0:
+            return None
+        return self._brushes[round(min(level, 1.0) * HIGHLIGHT_STEPS)]
+
+    def _row_of_slot(self, slot: int) -> int:
+        if self._rows_stale:
+            rows = self._rows
+            for row, order_slot in enumerate(self._order):
+                rows[order_slot] = row
+            self._rows_stale = False
+        return self._rows[slot]
+
+    def _move_slot_to_top(self, slot: int):
+        row = self._row_of_slot(slot)
+        if row <= 0:
+            return
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), 0)
+        order = self._order
+        order.insert(0, order.pop(row))
+        rows = self._rows
+        for shifted_row in range(row + 1):
+            rows[order[shifted_row]] = shifted_row
+        self.endMoveRows()
+
+    def _set_order(self, order: list[int]):
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_slots = [self._order[index.row()] for index in persistent]
+        self._order = order
+        self._rows_stale = True
+        self.changePersistentIndexList(
+            persistent,
+            [
+                self.index(self._row_of_slot(slot), index.column())
+                for slot, index in zip(persistent_slots, persistent)
+            ],
+        )
+        self.layoutChanged.emit()
+
+    def _metric_value(self, channel_name: str, column: int) -> float | None:
+        if column in (RATE_COLUMN, BYTE_RATE_COLUMN):
+            return self.metrics.rates(channel_name, self._metrics_time)[column - RATE_COLUMN]
+        quantile = 0.5 if column == P50_COLUMN else 0.99
+        return self.metrics.percentiles(channel_name, self._metrics_time, [quantile])[0]
+
+    def _metric_text(self, channel_name: str, column: int) -> str:
+        if column in (RATE_COLUMN, BYTE_RATE_COLUMN):
+            rates = self.metrics.rates(channel_name, self._metrics_time)
+            return format_count(rates[column - RATE_COLUMN])
+        return format_interval(self._metric_value(channel_name, column))
+
+    def _sort_key(self, slot: int):
+        if self.sort_column == NAME_COLUMN:
+            return self._names[slot]
+        return self._metric_value(self._names[slot], self.sort_column)
+
+    def _apply_sort(self):
+        if not self.is_sorted or not self._order:
+            return
+        self._sorted_at = self._metrics_time
+        keys = {slot: self._sort_key(slot) for slot in self._order}
+        # Channels without recent arrivals have no percentile and always go last
+        ranked = [slot for slot in self._order if keys[slot] is not None]
+        ranked.sort(key=keys.__getitem__, reverse=self.sort_order == Qt.DescendingOrder)
+        self._set_order(ranked + [slot for slot in self._order if keys[slot] is None])
@@ -0,0 +1,22 @@
+from functools import lru_cache
+
+from PyQt5.QtGui import QFont, QFontDatabase
+
+from .utils import resource_path
+
+
+MONOSPACED_FONT = "assets/fonts/static/FiraCode-Regular.ttf"
+
+
+@lru_cache(maxsize=None)
+def monospaced_family() -> str:
+    """Family of the bundled monospaced font, registered with Qt on first use only."""
+    font_id = QFontDatabase.addApplicationFont(resource_path(MONOSPACED_FONT))
+    families = QFontDatabase.applicationFontFamilies(font_id)
+    if not families:
+        return QFontDatabase.systemFont(QFontDatabase.FixedFont).family()
+    return families[0]
+
+
+def monospaced_font() -> QFont:
+    return QFont(monospaced_family())
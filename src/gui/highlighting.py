@@ -1,41 +1,65 @@
 # src/gui/highlighting.py
 
-from PyQt5.QtWidgets import QListWidgetItem
+import time
+
 from PyQt5.QtCore import QTimer
-from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QAbstractItemView
+
+from core.instrumentation import HIGHLIGHT, instruments
+
+from .channel_model import ChannelListModel
 
 
 class Highlighter:
-    @staticmethod
-    def highlight_item(item: QListWidgetItem):
-        start_color = QColor("yellow")
-        end_color = QColor("white")
-
-        item.setBackground(start_color)
-
-        duration = 800
-        interval = 50
-
-        steps = duration // interval
-        delta_r = (end_color.red() - start_color.red()) / steps
-        delta_g = (end_color.green() - start_color.green()) / steps
-        delta_b = (end_color.blue() - start_color.blue()) / steps
-
-        current_step = 0
-
-        def update_color():
-            nonlocal current_step
-            if current_step <= steps:
-                new_color = QColor(
-                    int(start_color.red() + delta_r * current_step),
-                    int(start_color.green() + delta_g * current_step),
-                    int(start_color.blue() + delta_b * current_step),
-                )
-                item.setBackground(new_color)
-                current_step += 1
-            else:
-                timer.stop()
-
-        timer = QTimer()
-        timer.timeout.connect(update_color)
-        timer.start(interval)
+    """Fades channel backgrounds from a single shared timer.
+
+    A hit only stamps the channel's start time in the model, which works out the fade level
+    of the rows it paints; each tick moves the model's clock and repaints the viewport once,
+    until the latest fade has run out. With ``external_clock`` set, the owner calls ``tick``
+    itself instead of the internal timer.
+    """
+
+    def __init__(
+        self,
+        model: ChannelListModel,
+        view: QAbstractItemView,
+        duration: int = 800,
+        interval: int = 50,
+    ):
+        self.model = model
+        self.view = view
+        self.duration = duration / 1000
+        self.model.highlight_duration = self.duration
+        self._fading_until = 0.0
+        self.external_clock = False
+
+        self._timer = QTimer()
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.tick)
+
+    @property
+    def active(self) -> bool:
+        return self._fading_until > 0
+
+    def highlight_item(self, channel_name: str):
+        now = time.monotonic()
+        self.model.highlight(channel_name, now)
+        self._fading_until = now + self.duration
+        if not self.external_clock and not self._timer.isActive():
+            self._timer.start()
+
+    def clear(self):
+        self._fading_until = 0.0
+        self._timer.stop()
+
+    def tick(self):
+        if not self.active:
+            return
+        tick_started = instruments.start()
+        now = time.monotonic()
+        self.model.set_highlight_time(now)
+        self.view.viewport().update()
+        if now >= self._fading_until:
+            # This repaint clears the last fades
+            self.clear()
+        instruments.stop(HIGHLIGHT, tick_started)
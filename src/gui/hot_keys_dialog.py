@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from core.events import MONITOR
+
+from .refreshing_dialog import RefreshingDialog
+
+if TYPE_CHECKING:
+    from .main_window import RedisMonitor
+
+
+SHOWN_ROWS = 50  # Rows per table
+TABLES = [("commands", "Command"), ("prefixes", "Key Prefix"), ("keys", "Key")]
+
+
+class HotKeysDialog(RefreshingDialog):
+    """Command mix and hottest keys from keyspace notifications or sampled MONITOR."""
+
+    def __init__(self, main_widget: "RedisMonitor"):
+        super().__init__()
+        self.main_widget = main_widget
+        self.setWindowTitle("Hot Keys")
+        self.setMinimumSize(800, 400)
+        layout = QVBoxLayout()
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        tables_layout = QHBoxLayout()
+        self.tables: dict[str, QTableWidget] = {}
+        for name, title in TABLES:
+            table = QTableWidget(0, 3)
+            table.setHorizontalHeaderLabels([title, "Count", "Share"])
+            table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            vertical_header = table.verticalHeader()
+            horizontal_header = table.horizontalHeader()
+            assert vertical_header is not None and horizontal_header is not None
+            vertical_header.hide()
+            horizontal_header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+            tables_layout.addWidget(table)
+            self.tables[name] = table
+        layout.addLayout(tables_layout)
+
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        layout.addWidget(reset_button, alignment=Qt.AlignmentFlag.AlignRight)
+
+        self.setLayout(layout)
+        self.setWindowFlags(Qt.WindowType.Tool)
+
+    def refresh(self):
+        event_counters = self.main_widget.event_counters
+        snapshot = event_counters.snapshot(SHOWN_ROWS)
+        total = event_counters.total
+        for name, table in self.tables.items():
+            rows = snapshot[name]
+            table.setRowCount(len(rows))
+            for row, (text, count) in enumerate(rows):
+                share = f"{count / total:.1%}" if total else ""
+                for column, value in enumerate([text, f"{count:,}", share]):
+                    item = QTableWidgetItem(value)
+                    if column:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    table.setItem(row, column, item)
+
+        if self.main_widget.ingest_mode == MONITOR:
+            source = f"MONITOR, sampling 1 in {self.main_widget.monitor_sample_rate}"
+        else:
+            source = "keyspace notifications"
+        summary = f"{total:,} events from {source}; key counts are estimates"
+        if not total:
+            summary = "No events yet: choose Settings > Ingest Mode > Keyspace or MONITOR"
+        self.summary_label.setText(summary)
+
+    def reset(self):
+        self.main_widget.event_counters.clear()
+        self.refresh()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QCheckBox,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from core.instrumentation import QUEUE_DEPTH, QUEUE_WAIT, SIGNAL, STAGES, instruments
+
+from .channel_model import format_interval
+from .refreshing_dialog import RefreshingDialog
+
+
+LATENCY_STAGES = {SIGNAL, QUEUE_WAIT}  # Waiting rather than running code, so never busy
+COLUMNS = ["Stage", "Calls", "Items", "Busy", "Mean", "p50", "p99", "Max", "Per item"]
+
+
+class InstrumentationDialog(RefreshingDialog):
+    """Live per-stage timings of the pipeline, with profiler and allocation dumps."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Pipeline Timings")
+        self.setMinimumSize(760, 380)
+        layout = QVBoxLayout()
+
+        self.record_checkbox = QCheckBox("Record timings")
+        self.record_checkbox.setChecked(instruments.enabled)
+        self.record_checkbox.toggled.connect(self.set_recording)
+        layout.addWidget(self.record_checkbox)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(len(STAGES), len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        button_layout.addWidget(reset_button)
+        button_layout.addStretch()
+        self.profile_button = QPushButton()
+        self.profile_button.clicked.connect(self.toggle_profile)
+        button_layout.addWidget(self.profile_button)
+        self.tracing_button = QPushButton()
+        self.tracing_button.clicked.connect(self.toggle_tracing)
+        button_layout.addWidget(self.tracing_button)
+        self.dump_button = QPushButton("Dump Allocations...")
+        self.dump_button.clicked.connect(self.dump_allocations)
+        button_layout.addWidget(self.dump_button)
+        layout.addLayout(button_layout)
+
+        self.dump_label = QLabel()
+        layout.addWidget(self.dump_label)
+
+        self.setLayout(layout)
+        self.setWindowFlags(Qt.Tool)
+
+    def set_recording(self, enabled: bool):
+        if enabled and not instruments.enabled:
+            instruments.clear()
+        instruments.enabled = enabled
+        self.refresh()
+
+    def reset(self):
+        instruments.clear()
+        self.refresh()
+
+    def refresh(self):
+        snapshot = instruments.snapshot()
+        elapsed = snapshot["elapsed"]
+        stages = snapshot["stages"]
+        for row, (stage, label) in enumerate(STAGES.items()):
+            stats = stages.get(stage)
+            values = [label] + [""] * (len(COLUMNS) - 1)
+            if stats is not None and stats["calls"]:
+                calls = stats["calls"]
+                values[1:] = [
+                    f"{calls:,}",
+                    f"{stats['items']:,}",
+                    (
+                        f"{stats['total'] / elapsed:.1%}"
+                        if elapsed and stage not in LATENCY_STAGES
+                        else ""
+                    ),
+                    format_interval(stats["total"] / calls),
+                    format_interval(stats["p50"]),
+                    format_interval(stats["p99"]),
+                    format_interval(stats["max"]),
+                    format_interval(stats["total"] / stats["items"]) if stats["items"] else "",
+                ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+        if instruments.enabled:
+            summary = f"Recording for {elapsed:.0f}s"
+            depth = snapshot["gauges"].get(QUEUE_DEPTH)
+            if depth is not None:
+                summary += f"; ingest queue depth {depth[0]:,.0f}, at most {depth[1]:,.0f}"
+        else:
+            summary = "Not recording; timings cost close to nothing until switched on"
+        self.summary_label.setText(summary)
+        self.profile_button.setText(
+            "Stop Profiling..." if instruments.profiling else "Profile GUI Thread"
+        )
+        self.tracing_button.setText(
+            "Stop Tracing Allocations" if instruments.tracing else "Trace Allocations"
+        )
+        self.dump_button.setEnabled(instruments.tracing)
+
+    def toggle_profile(self):
+        if not instruments.profiling:
+            instruments.start_profile()
+        else:
+            path = self.ask_path("Save Profile", "red-moon.prof", "cProfile stats (*.prof)")
+            if path is None:
+                return  # Keep profiling until a file is chosen
+            try:
+                instruments.stop_profile(path)
+            except OSError as error:
+                self.show_error("Save Profile", error)
+            else:
+                self.dump_label.setText(f"Profile saved to {path}")
+        self.refresh()
+
+    def toggle_tracing(self):
+        if instruments.tracing:
+            instruments.stop_tracing()
+        else:
+            instruments.start_tracing()
+        self.refresh()
+
+    def dump_allocations(self):
+        path = self.ask_path(
+            "Dump Allocations", "red-moon.tracemalloc", "tracemalloc snapshot (*.tracemalloc)"
+        )
+        if path is None or not instruments.tracing:
+            return
+        try:
+            traced = instruments.dump_allocations(path)
+        except OSError as error:
+            self.show_error("Dump Allocations", error)
+            return
+        self.dump_label.setText(f"Snapshot of {traced:,} traced bytes saved to {path}")
+
+    def show_error(self, title: str, error: OSError):
+        self.dump_label.setText(f"{title} failed: {error}")
+        QMessageBox.warning(self, title, str(error))
+
+    def ask_path(self, title: str, default_name: str, file_filter: str) -> Optional[str]:
+        file_name, _ = QFileDialog.getSaveFileName(self, title, default_name, file_filter)
+        return file_name or None
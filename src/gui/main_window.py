@@ -1,5 +1,6 @@
 from __future__ import annotations
 import time
+from typing import TYPE_CHECKING
 
 from PyQt5.QtWidgets import (
     QWidget,
@@ -7,23 +8,72 @@ from PyQt5.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QTableView,
+    QHeaderView,
     QStatusBar,
     QPushButton,
     QAction,
     QMenuBar,
+    QMenu,
+    QActionGroup,
+    QInputDialog,
+    QMessageBox,
+    QApplication,
 )
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import QTimer
-from plyer import notification
-
+from PyQt5.QtCore import QModelIndex, Qt, QTimer, pyqtSignal
+
+from core import ChannelMetrics, FilterEngine, IngestQueue, MessageStore
+from core import filters
+from core.decoders import DecodePool
+from core.events import DEFAULT_SAMPLE_RATE, KEYSPACE, MONITOR, PUBSUB, EventCounters
+from core.export import NdjsonWriter, export_history
+from core.instrumentation import QUEUE_DEPTH, QUEUE_WAIT, STORE, instruments
+from core.ingest_queue import DROP_OLDEST, KEEP_LATEST, SAMPLE
+from core.search import SearchIndex
+from core.messages import SOURCE_SCHEMES, split_list
+from core.segment_log import LogSeeder, SegmentLog
+from core.staleness import (
+    NotificationWorker,
+    StaleDetector,
+    format_rules,
+    parse_rules,
+    silence_message,
+)
 from redis_logic import RedisSubscriber
 
-from .utils import START_STYLESHEET, STOP_STYLESHEET, resource_path
-from .output_window import OutputWindowUI
+from .utils import START_STYLESHEET, STOP_STYLESHEET, get_export_path, resource_path
+from .channel_model import NAME_COLUMN, ChannelListModel
 from .output_manager import OutputWindowManager
 from .highlighting import Highlighter
+from .render_scheduler import RenderScheduler
+
+# Dialogs are imported when first opened and the stats poller, which brings in redis, when
+# it first starts, keeping their modules out of startup
+if TYPE_CHECKING:
+    from core.stats import StatsPoller
+
+    from .hot_keys_dialog import HotKeysDialog
+    from .instrumentation_dialog import InstrumentationDialog
+    from .search_dialog import SearchDialog
+    from .stats_dialog import StatsDialog
+
+
+STALE_CHECK_INTERVAL = 5000  # Milliseconds; a check only visits channels past their deadline
+STATUS_HOLD = 5000  # Milliseconds a reported status stays before the monitoring text returns
+
+
+def send_notification(title: str, message: str):
+    # plyer probes for a platform backend on import, so wait for the first notification
+    from plyer import notification
+
+    notification.notify(
+        title=title,
+        message=message,
+        app_name="Red Moon",
+        app_icon=resource_path("assets/red-moon.ico"),
+        timeout=30,
+    )
 
 
 class UISetup:
@@ -37,16 +87,23 @@ class UISetup:
 
         self.channel_update_timer = QTimer()
         self.channel_update_timer.timeout.connect(self.check_channel_updates)
-        self.channel_update_timer.start(60000)  # Start the timer with a 1-minute interval
+        self.channel_update_timer.start(STALE_CHECK_INTERVAL)
+
+        self.metrics_timer = QTimer()
+        self.metrics_timer.timeout.connect(self.refresh_metrics)
+        self.metrics_timer.start(1000)
 
         self.start_stop_button: QPushButton
 
     def check_channel_updates(self):
         self.main_widget.channel_manager.check_channel_updates()
 
+    def refresh_metrics(self):
+        self.main_widget.channel_model.refresh_metrics(time.time())
+
     def setup_ui(self):
         self.main_widget.setWindowTitle("Redis Monitoring Tool")
-        self.main_widget.setMinimumWidth(400)
+        self.main_widget.setMinimumWidth(560)
 
         layout = QVBoxLayout()
         self.main_widget.setWindowIcon(QIcon(resource_path("assets/red-moon.png")))
@@ -66,11 +123,21 @@ class UISetup:
             "*",
             "*",
         )
+        self.redis_url_input.setToolTip("Separate several Redis URLs with commas")
+        self.channel_pattern_input.setToolTip("Separate several channel patterns with commas")
 
         self.add_monitoring_buttons(layout)
 
-        self.main_widget.channel_list = QListWidget()
-        self.main_widget.channel_list.itemClicked.connect(self.main_widget.open_output_window)
+        self.main_widget.channel_model = ChannelListModel(
+            self.main_widget.channel_metrics, self.main_widget
+        )
+        self.main_widget.channel_list = self.create_channel_view()
+        self.main_widget.channel_list.clicked.connect(self.main_widget.open_output_window)
+        self.main_widget.highlighter = Highlighter(
+            self.main_widget.channel_model, self.main_widget.channel_list
+        )
+        self.main_widget.render_scheduler = RenderScheduler(self.main_widget)
+        self.main_widget.render_scheduler.set_enabled(True)
         layout.addWidget(self.main_widget.channel_list)
 
         self.main_widget.status_bar = QStatusBar()
@@ -82,6 +149,29 @@ class UISetup:
             self.main_widget.width() + 200, self.main_widget.height() + 100
         )
 
+    def create_channel_view(self):
+        # QTableView with fixed row heights lays out only the visible rows, unlike QListView
+        channel_list = QTableView()
+        channel_list.setModel(self.main_widget.channel_model)
+        channel_list.setShowGrid(False)
+        channel_list.setSelectionBehavior(QTableView.SelectRows)
+        channel_list.setSelectionMode(QTableView.ExtendedSelection)
+        header = channel_list.horizontalHeader()
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setSectionResizeMode(NAME_COLUMN, QHeaderView.Stretch)
+        # Sized from the font: sizing to contents would measure every row
+        header.setDefaultSectionSize(channel_list.fontMetrics().horizontalAdvance("00.0 ms") + 16)
+        # No sort indicator means channels stay in recency order until a header is clicked
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        header.sortIndicatorChanged.connect(self.main_widget.sort_changed)
+        channel_list.setSortingEnabled(True)
+        channel_list.verticalHeader().hide()
+        channel_list.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        row_height = channel_list.fontMetrics().height() + 4
+        channel_list.verticalHeader().setDefaultSectionSize(row_height)
+        return channel_list
+
     def add_monitoring_buttons(self, layout: QVBoxLayout):
         button_layout = QHBoxLayout()  # Horizontal layout for the buttons
 
@@ -98,13 +188,110 @@ class UISetup:
     def create_menu_bar(self):
         menu_bar = QMenuBar(self.main_widget)
         menu = menu_bar.addMenu("Settings")
-        reorder_action = QAction("Reorder Channels", self.main_widget)
-        reorder_action.setCheckable(True)
-        reorder_action.setChecked(True)
-        reorder_action.triggered.connect(self.main_widget.toggle_reorder)
-        menu.addAction(reorder_action)
+        self.reorder_action = QAction("Reorder Channels", self.main_widget)
+        self.reorder_action.setCheckable(True)
+        self.reorder_action.setChecked(True)
+        self.reorder_action.triggered.connect(self.main_widget.toggle_reorder)
+        menu.addAction(self.reorder_action)
+        throttle_action = QAction("Throttle Rendering", self.main_widget)
+        throttle_action.setCheckable(True)
+        throttle_action.setChecked(True)
+        throttle_action.triggered.connect(self.main_widget.toggle_throttle)
+        menu.addAction(throttle_action)
+        frame_rate_action = QAction("Frame Rate...", self.main_widget)
+        frame_rate_action.triggered.connect(self.main_widget.set_frame_rate)
+        menu.addAction(frame_rate_action)
+        menu.addMenu(self.create_overload_menu())
+        menu.addMenu(self.create_mode_menu())
+        silence_action = QAction("Silence Thresholds...", self.main_widget)
+        silence_action.triggered.connect(self.main_widget.set_silence_thresholds)
+        menu.addAction(silence_action)
+        filters_action = QAction("Filters...", self.main_widget)
+        filters_action.triggered.connect(self.main_widget.set_filters)
+        menu.addAction(filters_action)
+        history_action = QAction("History Size...", self.main_widget)
+        history_action.triggered.connect(self.main_widget.set_history_size)
+        menu.addAction(history_action)
+        stats_action = QAction("Poll Server Stats", self.main_widget)
+        stats_action.setCheckable(True)
+        stats_action.setChecked(self.main_widget.poll_stats)
+        stats_action.triggered.connect(self.main_widget.toggle_stats_polling)
+        menu.addAction(stats_action)
+        disk_history_action = QAction("Keep Full History On Disk", self.main_widget)
+        disk_history_action.setCheckable(True)
+        disk_history_action.triggered.connect(self.main_widget.toggle_disk_history)
+        menu.addAction(disk_history_action)
+        clear_action = QAction("Clear Channels", self.main_widget)
+        clear_action.triggered.connect(self.main_widget.clear_channels)
+        menu.addAction(clear_action)
+
+        export_menu = menu_bar.addMenu("Export")
+        export_action = QAction("Export Selected Channels...", self.main_widget)
+        export_action.triggered.connect(self.main_widget.export_selected_channels)
+        export_menu.addAction(export_action)
+        self.record_action = QAction("Record Session...", self.main_widget)
+        self.record_action.setCheckable(True)
+        self.record_action.triggered.connect(self.main_widget.toggle_recording)
+        export_menu.addAction(self.record_action)
+
+        search_menu = menu_bar.addMenu("Search")
+        search_action = QAction("Search Messages...", self.main_widget)
+        search_action.setShortcut("Ctrl+F")
+        search_action.triggered.connect(self.main_widget.open_search)
+        search_menu.addAction(search_action)
+
+        view_menu = menu_bar.addMenu("View")
+        hot_keys_action = QAction("Hot Keys...", self.main_widget)
+        hot_keys_action.triggered.connect(self.main_widget.open_hot_keys)
+        view_menu.addAction(hot_keys_action)
+        stats_view_action = QAction("Server Stats...", self.main_widget)
+        stats_view_action.triggered.connect(self.main_widget.open_server_stats)
+        view_menu.addAction(stats_view_action)
+        timings_action = QAction("Pipeline Timings...", self.main_widget)
+        timings_action.triggered.connect(self.main_widget.open_instrumentation)
+        view_menu.addAction(timings_action)
         return menu_bar
 
+    def create_overload_menu(self):
+        overload_menu = QMenu("Overload Policy", self.main_widget)
+        policy_group = QActionGroup(self.main_widget)
+        policies = [
+            (DROP_OLDEST, "Drop Oldest"),
+            (KEEP_LATEST, "Keep Latest Per Channel"),
+            (SAMPLE, "Sample 1 in N Per Channel"),
+        ]
+        for policy, text in policies:
+            action = QAction(text, self.main_widget)
+            action.setCheckable(True)
+            action.setChecked(policy == self.main_widget.ingest_queue.policy)
+            action.triggered.connect(
+                lambda _, policy=policy: self.main_widget.ingest_queue.set_policy(policy)
+            )
+            policy_group.addAction(action)
+            overload_menu.addAction(action)
+        return overload_menu
+
+    def create_mode_menu(self):
+        mode_menu = QMenu("Ingest Mode", self.main_widget)
+        mode_group = QActionGroup(self.main_widget)
+        modes = [
+            (PUBSUB, "Pub/Sub Channels"),
+            (KEYSPACE, "Keyspace Notifications"),
+            (MONITOR, "Sampled MONITOR Commands"),
+        ]
+        for mode, text in modes:
+            action = QAction(text, self.main_widget)
+            action.setCheckable(True)
+            action.setChecked(mode == self.main_widget.ingest_mode)
+            action.triggered.connect(lambda _, mode=mode: self.main_widget.set_ingest_mode(mode))
+            mode_group.addAction(action)
+            mode_menu.addAction(action)
+        mode_menu.addSeparator()
+        sample_rate_action = QAction("MONITOR Sample Rate...", self.main_widget)
+        sample_rate_action.triggered.connect(self.main_widget.set_monitor_sample_rate)
+        mode_menu.addAction(sample_rate_action)
+        return mode_menu
+
     def create_labeled_input(
         self, layout: QVBoxLayout, label_text: str, placeholder_text: str, default_text: str
     ):
@@ -127,64 +314,120 @@ class UISetup:
 class ChannelManager:
     def __init__(self, main_widget: "RedisMonitor"):
         self.main_widget = main_widget
-        self.channel_last_update: dict[str, float] = {}
 
     def add_channel(self, channel_name: str, data: str, status: str):
-        channels_names = [
-            self.main_widget.channel_list.item(i).text()
-            for i in range(self.main_widget.channel_list.count())
-        ]
-        self.channel_last_update[channel_name] = time.time()
         if status != "success":
             self.main_widget.status_bar.showMessage(f"Status: {status}")
             return
-        self.main_widget.status_bar.showMessage("Status: Monitoring")
-
+        self.add_channels([(channel_name, data.encode("utf-8"), time.time())])
 
-        if channel_name in channels_names:
-            index = channels_names.index(channel_name)
-            item = (
-                self.main_widget.channel_list.takeItem(index)
-                if self.main_widget.reorder_channels
-                else self.main_widget.channel_list.item(index)
-            )
-        else:
-            item = QListWidgetItem(channel_name)
-            self.main_widget.channel_list.addItem(item)
-
-        Highlighter.highlight_item(item)
-
-        if self.main_widget.reorder_channels and channel_name in channels_names:
-            self.main_widget.channel_list.insertItem(0, item)
-
-        if channel_name not in self.main_widget.output_windows_ui:
-            self.main_widget.output_windows_ui[channel_name] = OutputWindowUI(channel_name)
+    def add_channels(self, messages: list[tuple[str, bytes, float]]):
+        """Store a batch of (channel, payload, timestamp) messages and queue a UI update."""
+        if not messages:
+            return
 
-        self.main_widget.output_windows_ui[channel_name].update_output(data)
+        started = instruments.start()
+        now = time.time()
+        message_store = self.main_widget.message_store
+        # Only the last occurrence of a channel decides its final position in the list
+        latest: dict[str, int] = {}
+        for channel_name, payload, timestamp in messages:
+            latest[channel_name] = latest.pop(channel_name, 0) + 1
+            message_store.append(channel_name, payload, timestamp)
+        if self.main_widget.message_log is not None:
+            self.main_widget.message_log.append_batch(messages)
+        elif self.main_widget.log_seeder is not None:
+            self.main_widget.log_seeder.backlog.extend(messages)
+        for channel_name in latest:
+            self.main_widget.stale_detector.touch(channel_name, now)
+
+        status = "Status: Monitoring"
+        dropped_total = self.main_widget.ingest_queue.dropped_total
+        if dropped_total:
+            status = f"{status}, {dropped_total} messages dropped by overload policy"
+        filtered = self.main_widget.filter_engine.filtered
+        if filtered:
+            status = f"{status}, {filtered} messages filtered out"
+        self.main_widget.render_scheduler.mark_dirty(latest, now, status)
+        instruments.stop(STORE, started, len(messages))
+
+    def drain_ingest_queue(self, limit: int | None = None):
+        ingest_queue = self.main_widget.ingest_queue
+        dropped = ingest_queue.take_dropped()
+        if dropped:
+            self.main_widget.channel_model.add_dropped(dropped, time.time())
+        if instruments.enabled:
+            instruments.gauge(QUEUE_DEPTH, len(ingest_queue))
+        messages = ingest_queue.drain(limit)
+        if instruments.enabled:
+            instruments.record_ages(QUEUE_WAIT, messages, time.time())
+        self.add_channels(messages)
+
+    def update_channel_items(self, counts: dict[str, int], timestamp: float):
+        channel_model = self.main_widget.channel_model
+        moved = []
+        for channel_name, count in counts.items():
+            if not channel_model.touch(channel_name, timestamp, count):
+                moved.append(channel_name)
+            self.main_widget.highlighter.highlight_item(channel_name)
+
+        if self.main_widget.reorder_channels and not channel_model.is_sorted:
+            channel_model.move_many_to_top(moved)
+
+    def clear_channels(self):
+        self.main_widget.ingest_queue.clear()
+        self.main_widget.render_scheduler.clear()
+        self.main_widget.highlighter.clear()
+        self.main_widget.channel_model.clear()
+        self.main_widget.channel_metrics.clear()
+        self.main_widget.stale_detector.clear()
+        self.main_widget.search_index.clear()
+        self.main_widget.filter_engine.clear()
+        self.main_widget.event_counters.clear()
+        for window in self.main_widget.output_windows_ui.values():
+            window.close()
+        self.main_widget.output_windows_ui.clear()
+        self.main_widget.message_store.clear()
+        # Sequence numbers start over, so cached decodes would match the wrong messages
+        self.main_widget.decode_pool.clear()
+        if self.main_widget.message_log is not None:
+            self.main_widget.message_log.clear()
+        if self.main_widget.log_seeder is not None:
+            # What it is copying was just cleared, so start the log out empty
+            self.main_widget.cancel_log_seeding()
+            self.main_widget.message_log = SegmentLog()
+
+    def update_output_window(self, channel_name: str):
+        output_window = self.main_widget.output_windows_ui.get(channel_name)
+        if output_window is not None:
+            output_window.update_output()
 
     def check_channel_updates(self):
-        current_time = time.time()
-        for channel_name, last_update_time in self.channel_last_update.items():
-            if (
-                current_time - last_update_time > 60
-            ):  # Check if 1 minute has passed since last update
-                notification.notify(
-                    title="No Data Received",
-                    message=f"No data received for channel '{channel_name}' in the last minute.",
-                    app_name="Red Moon",
-                    app_icon=resource_path("assets/red-moon.ico"),
-                    timeout=30,
-                )
+        stale_detector = self.main_widget.stale_detector
+        # Channels sharing a threshold are reported in one notification
+        silent: dict[float, list[str]] = {}
+        for channel_name in stale_detector.expired(time.time()):
+            silent.setdefault(stale_detector.threshold(channel_name), []).append(channel_name)
+        for threshold, channel_names in silent.items():
+            self.main_widget.notifier.post(
+                "No Data Received", silence_message(channel_names, threshold)
+            )
 
 
 class RedisMonitor(QWidget):
+    status_reported = pyqtSignal(str)  # Status text from worker threads, shown in the status bar
+    log_seeded = pyqtSignal(object)  # A LogSeeder whose thread has copied the memory history
+
     def __init__(self):
         super().__init__()
         self.init_classes()
         self.ui_setup.setup_ui()
+        self.status_reported.connect(self.show_status)
+        self.log_seeded.connect(self.install_message_log)
 
         self.reorder_channels = True
         self.subscriber = None
+        self.stopping_subscribers: list[RedisSubscriber] = []
         self.monitoring = False  # To track the state of monitoring
 
 
@@ -193,43 +436,387 @@ class RedisMonitor(QWidget):
         self.channel_manager = ChannelManager(self)
         self.window_manager = OutputWindowManager(self)
         self.output_windows_ui = {}
+        self.status_held_until = 0.0  # Monotonic time until which show_status keeps the bar
+        self.message_store = MessageStore()
+        self.ingest_queue = IngestQueue()
+        self.channel_metrics = ChannelMetrics()
+        self.stale_detector = StaleDetector()
+        self.filter_engine = FilterEngine()
+        self.event_counters = EventCounters()
+        self.ingest_mode = PUBSUB
+        self.monitor_sample_rate = DEFAULT_SAMPLE_RATE
+        self.hot_keys_dialog: HotKeysDialog | None = None
+        self.poll_stats = True
+        self.stats_poller: StatsPoller | None = None
+        self.stats_dialog: StatsDialog | None = None
+        self.instrumentation_dialog: InstrumentationDialog | None = None
+        self.notifier = NotificationWorker(send_notification, self.status_reported.emit)
+        self.recorder: NdjsonWriter | None = None
+        self.message_log: SegmentLog | None = None
+        self.log_seeder: LogSeeder | None = None  # Set while a new message log is seeded
+        self.search_index = SearchIndex()
+        self.decode_pool = DecodePool()
+        self.search_dialog: SearchDialog | None = None
+
+        # Set by UISetup.setup_ui
+        self.channel_model: ChannelListModel
+        self.channel_list: QTableView
+        self.highlighter: Highlighter
+        self.render_scheduler: RenderScheduler
+        self.status_bar: QStatusBar
+        # Set by OutputWindowManager once the first output window opens
+        self.output_window_x: int
+        self.output_window_y: int
 
         self.open_window_positions = []
 
+    def show_status(self, status: str):
+        """Show a one-shot status, e.g. an export outcome, for ``STATUS_HOLD`` milliseconds."""
+        self.status_bar.showMessage(f"Status: {status}", STATUS_HOLD)
+        self.status_held_until = time.monotonic() + STATUS_HOLD / 1000
+
     def toggle_reorder(self):
         self.reorder_channels = not self.reorder_channels
+        if self.reorder_channels:
+            # Recency order replaces any column sort
+            self.channel_list.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+
+    def sort_changed(self, column: int, order: Qt.SortOrder):
+        if column >= 0 and self.reorder_channels:
+            self.reorder_channels = False
+            self.ui_setup.reorder_action.setChecked(False)
+
+    def clear_channels(self):
+        self.channel_manager.clear_channels()
+
+    def toggle_throttle(self):
+        self.render_scheduler.set_enabled(not self.render_scheduler.enabled)
+
+    def set_frame_rate(self):
+        fps, ok = QInputDialog.getInt(
+            self, "Frame Rate", "UI updates per second:", self.render_scheduler.fps, 1, 120
+        )
+        if ok:
+            self.render_scheduler.set_fps(fps)
+
+    def set_history_size(self):
+        max_messages, ok = QInputDialog.getInt(
+            self,
+            "History Size",
+            "Messages kept per channel:",
+            self.message_store.max_messages,
+            1,
+            1_000_000,
+        )
+        if ok:
+            self.message_store.set_limits(max_messages, self.message_store.max_bytes)
+
+    def set_silence_thresholds(self):
+        text, ok = QInputDialog.getMultiLineText(
+            self,
+            "Silence Thresholds",
+            "One '<channel glob> <seconds>' per line; the first match wins and 0 never "
+            f"notifies.\nOther channels are reported after {self.stale_detector.default:g}s.",
+            format_rules(self.stale_detector.rules),
+        )
+        if not ok:
+            return
+        try:
+            self.stale_detector.set_rules(parse_rules(text))
+        except ValueError as error:
+            QMessageBox.warning(self, "Silence Thresholds", str(error))
+
+    def set_ingest_mode(self, mode: str):
+        self.ingest_mode = mode
+        if mode == PUBSUB:
+            self.ui_setup.channel_pattern_input.setToolTip(
+                "Separate several channel patterns with commas"
+            )
+        else:
+            self.ui_setup.channel_pattern_input.setToolTip(
+                "Key pattern; keyspace and MONITOR events come from the first Redis URL"
+            )
+        if self.monitoring:
+            # The subscriber is built for one mode, so start a new one
+            self.restart_monitoring()
+
+    def set_monitor_sample_rate(self):
+        sample_rate, ok = QInputDialog.getInt(
+            self,
+            "MONITOR Sample Rate",
+            "Forward 1 in N commands (counts are scaled back up):",
+            self.monitor_sample_rate,
+            1,
+            10_000,
+        )
+        if not ok:
+            return
+        self.monitor_sample_rate = sample_rate
+        if self.monitoring and self.ingest_mode == MONITOR:
+            self.restart_monitoring()
+
+    def open_hot_keys(self):
+        if self.hot_keys_dialog is None:
+            from .hot_keys_dialog import HotKeysDialog
+
+            self.hot_keys_dialog = HotKeysDialog(self)
+        self.hot_keys_dialog.show()
+        self.hot_keys_dialog.raise_()
+
+    def open_server_stats(self):
+        if self.stats_dialog is None:
+            from .stats_dialog import StatsDialog
+
+            self.stats_dialog = StatsDialog(self)
+        self.stats_dialog.show()
+        self.stats_dialog.raise_()
+
+    def open_instrumentation(self):
+        if self.instrumentation_dialog is None:
+            from .instrumentation_dialog import InstrumentationDialog
+
+            self.instrumentation_dialog = InstrumentationDialog()
+        self.instrumentation_dialog.show()
+        self.instrumentation_dialog.raise_()
+
+    def toggle_stats_polling(self):
+        self.poll_stats = not self.poll_stats
+        if not self.monitoring:
+            return
+        if self.poll_stats:
+            self.start_stats_poller()
+        else:
+            self.stop_stats_poller()
+
+    def start_stats_poller(self):
+        redis_urls = split_list(self.ui_setup.redis_url_input.text())
+        if not redis_urls or redis_urls[0].startswith(SOURCE_SCHEMES):
+            return  # Recorded and synthetic traffic has no server to ask
+        from core.stats import StatsPoller
+
+        try:
+            self.stats_poller = StatsPoller(
+                redis_urls[0],
+                received=lambda: self.subscriber.received if self.subscriber else 0,
+                on_status=self.status_reported.emit,
+            )
+        except ValueError as error:
+            self.status_bar.showMessage(f"Status: Server stats unavailable ({error})")
+            return
+        self.stats_poller.start()
+
+    def stop_stats_poller(self):
+        if self.stats_poller is not None:
+            self.stats_poller.stop()
+            self.stats_poller = None
+
+    def set_filters(self):
+        text, ok = QInputDialog.getMultiLineText(
+            self,
+            "Filters",
+            "One rule per line, applied as messages arrive:\n"
+            "  include <channel glob>, exclude <channel glob>\n"
+            "  keep <payload text>, drop <payload text>\n"
+            "Any rule takes re:<regex> instead; keep and drop also json:<path>[=<value>].\n"
+            "With include or keep rules, only messages matching one of them pass.",
+            filters.format_rules(self.filter_engine.rules),
+        )
+        if not ok:
+            return
+        try:
+            self.filter_engine.set_rules(filters.parse_rules(text))
+        except ValueError as error:
+            QMessageBox.warning(self, "Filters", str(error))
+
+    def toggle_disk_history(self):
+        if self.log_seeder is not None:
+            # Still copying, so open windows are reading memory as before
+            self.cancel_log_seeding()
+            return
+        if self.message_log is not None:
+            self.reset_history_readers()
+            self.message_log.close()
+            self.message_log = None
+            return
+
+        # Seed the log with what is still in memory so no channel starts out empty. Copying
+        # the buffers is quick; writing them to disk happens on the seeder's thread.
+        snapshots = [
+            (channel_name, *buffer.snapshot())
+            for channel_name, buffer in self.message_store.buffers.items()
+        ]
+        self.log_seeder = LogSeeder(snapshots, self.log_seeded.emit)
+        self.log_seeder.start()
+        self.status_bar.showMessage("Status: Copying the history in memory to disk")
+
+    def install_message_log(self, seeder: LogSeeder):
+        if seeder is not self.log_seeder:
+            return  # Cancelled after it finished; cancel_log_seeding removed its log
+        self.log_seeder = None
+        seeder.log.append_batch(seeder.backlog)
+        seeder.backlog.clear()
+        self.reset_history_readers()
+        self.message_log = seeder.log
+        self.status_bar.showMessage("Status: Keeping the full history on disk")
+
+    def reset_history_readers(self):
+        # Open windows read from the history they were opened with, so start them afresh
+        for window in self.output_windows_ui.values():
+            window.close()
+        self.output_windows_ui.clear()
+        # Log and memory number messages differently, so cached decodes no longer apply
+        self.decode_pool.clear()
+
+    def cancel_log_seeding(self):
+        if self.log_seeder is not None:
+            self.log_seeder.cancel()
+            self.log_seeder = None
+
+    def open_search(self):
+        if self.search_dialog is None:
+            from .search_dialog import SearchDialog
+
+            self.search_dialog = SearchDialog(self)
+        self.search_dialog.show()
+        self.search_dialog.raise_()
+        self.search_dialog.query_input.setFocus()
+
+    def export_selected_channels(self):
+        rows = self.channel_list.selectionModel().selectedRows(NAME_COLUMN)
+        channel_names = [self.channel_model.channel_name(index) for index in rows]
+        if not channel_names:
+            self.status_bar.showMessage("Status: Select the channels to export first")
+            return
+        file_name = get_export_path(self, "Export Selected Channels", "channels.ndjson")
+        if not file_name:
+            return
+        history = self.message_log if self.message_log is not None else self.message_store
+        histories = [
+            (channel_name, history.get(channel_name))
+            for channel_name in channel_names
+            if channel_name in history
+        ]
+        try:
+            export_history(file_name, histories, on_status=self.status_reported.emit)
+        except RuntimeError as error:
+            self.show_status(f"Cannot export to {file_name}: {error}")
+            return
+        self.status_bar.showMessage(f"Status: Exporting {len(histories)} channels to {file_name}")
+
+    def toggle_recording(self):
+        if self.recorder is not None:
+            self.stop_recording()
+            return
+        file_name = get_export_path(self, "Record Session", "session.ndjson")
+        if not file_name:
+            self.ui_setup.record_action.setChecked(False)
+            return
+        try:
+            self.recorder = NdjsonWriter(file_name, on_status=self.status_reported.emit)
+        except RuntimeError as error:  # e.g. a .zst name without zstandard installed
+            self.ui_setup.record_action.setChecked(False)
+            self.show_status(f"Cannot record to {file_name}: {error}")
+            return
+        if self.subscriber:
+            self.subscriber.recorder = self.recorder
+        self.status_bar.showMessage(f"Status: Recording to {file_name}")
+
+    def stop_recording(self):
+        if self.subscriber:
+            self.subscriber.recorder = None
+        recorder, self.recorder = self.recorder, None
+        recorder.finish()
+        self.ui_setup.record_action.setChecked(False)
+        self.status_bar.showMessage(f"Status: Recording saved to {recorder.path}")
 
     def toggle_monitoring(self):
         if self.monitoring:
             self.stop_monitoring()
-            self.ui_setup.start_stop_button.setStyleSheet(START_STYLESHEET)
-            self.ui_setup.start_stop_button.setText("Start")
+            self.set_monitoring(False)
         else:
-            self.start_monitoring()
-            self.ui_setup.start_stop_button.setStyleSheet(STOP_STYLESHEET)
-            self.ui_setup.start_stop_button.setText("Stop")
-        self.monitoring = not self.monitoring
-
-    def start_monitoring(self):
+            self.set_monitoring(self.start_monitoring())
+
+    def set_monitoring(self, monitoring: bool):
+        self.monitoring = monitoring
+        button = self.ui_setup.start_stop_button
+        button.setChecked(monitoring)
+        button.setStyleSheet(STOP_STYLESHEET if monitoring else START_STYLESHEET)
+        button.setText("Stop" if monitoring else "Start")
+
+    def restart_monitoring(self):
+        self.stop_monitoring()
+        if not self.start_monitoring():
+            self.set_monitoring(False)
+
+    def start_monitoring(self) -> bool:
+        """Start a subscriber for the URL and pattern fields; False if they are unusable."""
         redis_url = self.ui_setup.redis_url_input.text()
         channel_pattern = self.ui_setup.channel_pattern_input.text()
-        self.subscriber = RedisSubscriber(redis_url, channel_pattern)
+        try:
+            self.subscriber = RedisSubscriber(
+                redis_url,
+                channel_pattern,
+                self.ingest_queue,
+                self.channel_metrics,
+                self.search_index,
+                self.filter_engine,
+                self.event_counters,
+                self.ingest_mode,
+                self.monitor_sample_rate,
+            )
+        except ValueError as error:
+            self.status_bar.showMessage(f"Status: Not Monitoring ({error})")
+            return False
         self.subscriber.new_channel.connect(self.channel_manager.add_channel)
+        self.subscriber.messages_ready.connect(self.render_scheduler.wake)
+        self.subscriber.recorder = self.recorder
         self.subscriber.start()
+        if self.poll_stats:
+            self.start_stats_poller()
         self.status_bar.showMessage("Status: Monitoring")
+        return True
 
     def stop_monitoring(self):
-        self.channel_manager.channel_last_update.clear()
+        self.stale_detector.clear()
+        self.stop_stats_poller()
 
         if self.subscriber:
-            self.subscriber.terminate()
+            if not self.subscriber.stop():
+                # Detached but still running; a QThread must outlive its thread
+                self.stopping_subscribers.append(self.subscriber)
+            self.stopping_subscribers = [
+                subscriber for subscriber in self.stopping_subscribers if subscriber.isRunning()
+            ]
+            self.subscriber = None
             self.status_bar.showMessage("Status: Not Monitoring")
 
-    def open_output_window(self, item: QListWidgetItem):
-        self.window_manager.open_output_window(item)
+    def open_output_window(self, index: QModelIndex):
+        if QApplication.keyboardModifiers() & (
+            Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier
+        ):
+            return  # Extending the selection, e.g. to export several channels
+        self.window_manager.open_output_window(self.channel_model.channel_name(index))
 
     def closeEvent(self, event):
+        if self.subscriber:
+            self.subscriber.stop()
+        self.stop_stats_poller()
+        self.notifier.stop()
+        self.decode_pool.shutdown()
+        if self.recorder is not None:
+            self.stop_recording()
         for window in self.output_windows_ui.values():
 
             window.close()
+        self.cancel_log_seeding()
+        if self.message_log is not None:
+            self.message_log.close()
+        if self.search_dialog is not None:
+            self.search_dialog.close()
+        if self.hot_keys_dialog is not None:
+            self.hot_keys_dialog.close()
+        if self.stats_dialog is not None:
+            self.stats_dialog.close()
+        if self.instrumentation_dialog is not None:
+            self.instrumentation_dialog.close()
         event.accept()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from typing import Callable, Hashable, Optional, Union
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, Qt
+from PyQt5.QtGui import QFont, QFontMetrics
+from PyQt5.QtWidgets import QStyle, QStyledItemDelegate
+
+from core import MessageBuffer
+from core.decoders import AUTO, DecodePool, decodes_inline
+from core.decoding import preview_text
+from core.segment_log import ChannelLog
+
+
+SEQ_ROLE = Qt.ItemDataRole.UserRole
+PAYLOAD_ROLE = Qt.ItemDataRole.UserRole + 1
+TIMESTAMP_ROLE = Qt.ItemDataRole.UserRole + 2
+PREVIEW_BYTES = 512  # Bytes of a payload decoded for its one-line preview
+
+History = Union[MessageBuffer, ChannelLog]
+
+
+class MessageListModel(QAbstractListModel):
+    """Read-only view of a channel's MessageBuffer or on-disk ChannelLog.
+
+    The buffer is appended to from outside; ``sync`` turns what changed since the last call
+    into row removals at the front (evictions) and row insertions at the end. Only the
+    visible rows are ever read, so a ChannelLog is paged from disk as the view scrolls.
+
+    Previews that need more than the raw text go through the ``DecodePool``: the raw
+    preview is shown until ``seq_decoded`` reports the decoded one, so only rows that are
+    actually painted are ever decoded.
+    """
+
+    def __init__(
+        self,
+        buffer: History,
+        parent=None,
+        channel_name: str = "",
+        decode_pool: Optional[DecodePool] = None,
+    ):
+        super().__init__(parent)
+        self.buffer = buffer
+        self.channel_name = channel_name
+        self.decode_pool = decode_pool
+        self.decoder = AUTO
+        self.on_decoded: Optional[Callable[[Hashable], None]] = None
+        self._first_seq = buffer.first_seq
+        self._count = len(buffer)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        # Rows are numbered from the model's own first sequence number, which only catches
+        # up with the buffer in sync(); rows already evicted from the buffer have no data.
+        position = self._first_seq + index.row() - self.buffer.first_seq
+        if not 0 <= position < len(self.buffer):
+            return None
+        seq, timestamp, payload = self.buffer.get(position)
+        if role == Qt.DisplayRole:
+            return self.preview(seq, payload)
+        if role == SEQ_ROLE:
+            return seq
+        if role == PAYLOAD_ROLE:
+            return payload
+        if role == TIMESTAMP_ROLE:
+            return timestamp
+        return None
+
+    def preview(self, seq: int, payload: bytes) -> str:
+        if (
+            self.decode_pool is None
+            or self.on_decoded is None
+            or decodes_inline(self.decoder, payload)
+        ):
+            return preview_text(payload, PREVIEW_BYTES)
+        text = self.decode_pool.request(
+            (self.channel_name, seq, self.decoder, PREVIEW_BYTES),
+            payload,
+            self.decoder,
+            self.on_decoded,
+            PREVIEW_BYTES,
+        )
+        return preview_text(payload, PREVIEW_BYTES) if text is None else text
+
+    def set_decoder(self, decoder: str):
+        self.decoder = decoder
+        if self._count:
+            self.dataChanged.emit(
+                self.index(0), self.index(self._count - 1), [Qt.ItemDataRole.DisplayRole]
+            )
+
+    def seq_decoded(self, seq: int):
+        row = seq - self._first_seq
+        if 0 <= row < self._count:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+
+    def sync(self):
+        evicted = min(self.buffer.first_seq - self._first_seq, self._count)
+        if evicted > 0:
+            self.beginRemoveRows(QModelIndex(), 0, evicted - 1)
+            self._first_seq += evicted
+            self._count -= evicted
+            self.endRemoveRows()
+        self._first_seq = self.buffer.first_seq
+
+        added = len(self.buffer) - self._count
+        if added > 0:
+            self.beginInsertRows(QModelIndex(), self._count, self._count + added - 1)
+            self._count += added
+            self.endInsertRows()
+
+
+class MessageDelegate(QStyledItemDelegate):
+    """Paints a bold message number gutter followed by a monospaced payload preview."""
+
+    def __init__(self, font: QFont, parent=None):
+        super().__init__(parent)
+        self.font = font
+        self.number_font = QFont(font)
+        self.number_font.setBold(True)
+        self.metrics = QFontMetrics(font)
+        self.gutter_width = QFontMetrics(self.number_font).horizontalAdvance("00000000:")
+        self.row_height = self.metrics.height() + 4
+
+    def paint(self, painter, option, index):
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+            painter.setPen(option.palette.highlightedText().color())
+
+        rect = option.rect.adjusted(4, 0, -4, 0)
+        painter.setFont(self.number_font)
+        gutter = QRect(rect.left(), rect.top(), self.gutter_width, rect.height())
+        painter.drawText(gutter, Qt.AlignRight | Qt.AlignVCenter, f"{index.data(SEQ_ROLE)}:")
+
+        painter.setFont(self.font)
+        text_rect = rect.adjusted(self.gutter_width + 8, 0, 0, 0)
+        text = self.metrics.elidedText(index.data() or "", Qt.ElideRight, text_rect.width())
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, text)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(self.gutter_width, self.row_height)
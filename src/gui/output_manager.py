@@ -1,9 +1,6 @@
 from typing import TYPE_CHECKING
 
-from PyQt5.QtWidgets import (
-    QApplication,
-    QListWidgetItem,
-)
+from PyQt5.QtWidgets import QApplication
 
 if TYPE_CHECKING:
     from .main_window import RedisMonitor
@@ -13,12 +10,22 @@ class OutputWindowManager:
     def __init__(self, main_widget: "RedisMonitor"):
         self.main_widget = main_widget
 
-    def open_output_window(self, item: QListWidgetItem):
-        channel_name = item.text()
-        if channel_name not in self.main_widget.output_windows_ui:
+    def open_output_window(self, channel_name: str):
+        message_log = self.main_widget.message_log
+        if message_log is not None:
+            buffer = message_log.get(channel_name)
+        else:
+            buffer = self.main_widget.message_store.get(channel_name)
+        if buffer is None:
             return
 
-        output_window = self.main_widget.output_windows_ui[channel_name]
+        output_window = self.main_widget.output_windows_ui.get(channel_name)
+        if output_window is None:
+            # Imported on the first window, which is the first time its widgets are needed
+            from .output_window import OutputWindowUI
+
+            output_window = OutputWindowUI(channel_name, buffer, self.main_widget.decode_pool)
+            self.main_widget.output_windows_ui[channel_name] = output_window
         output_window.show()
 
         INITIAL_OFFSET_Y = 200
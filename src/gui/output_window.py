@@ -1,64 +1,160 @@
 from PyQt5.QtWidgets import (
     QVBoxLayout,
+    QHBoxLayout,
+    QComboBox,
+    QLabel,
     QDialog,
-    QTextEdit,
+    QTableView,
+    QHeaderView,
+    QPlainTextEdit,
     QPushButton,
-    QFileDialog,
+    QSplitter,
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFontDatabase, QFont
+from PyQt5.QtCore import Qt, pyqtSignal
 
-from .utils import resource_path
+from core.decoders import DECODERS, DecodePool
+from core.export import export_history
+
+from .fonts import monospaced_font
+from .message_model import (
+    PAYLOAD_ROLE,
+    SEQ_ROLE,
+    History,
+    MessageDelegate,
+    MessageListModel,
+)
+from .utils import get_export_path
 
 
 class OutputWindowUI(QDialog):
-    def __init__(self, channel_name, parent=None):
+    decoded = pyqtSignal(object)  # Key of a text the decode pool finished, from its thread
+    export_reported = pyqtSignal(str)  # Outcome of an export, from the writer thread
+
+    def __init__(self, channel_name, buffer: History, decode_pool: DecodePool, parent=None):
         super().__init__(parent)
         self.channel_name = channel_name
-        self.message_counter = 0
+        self.buffer = buffer
+        self.decode_pool = decode_pool
+        self.detail_key = None  # Decode pool key of the text meant for message_detail
 
         self.setWindowTitle(f"Output for {channel_name}")
         layout = QVBoxLayout()
 
-        self.output_text = QTextEdit()
-        self.output_text.setReadOnly(True)
-        layout.addWidget(self.output_text)
+        self.monospaced_font = monospaced_font()
+
+        decoder_layout = QHBoxLayout()
+        decoder_layout.addWidget(QLabel("Decode as:"))
+        self.decoder_input = QComboBox()
+        for decoder in DECODERS.values():
+            self.decoder_input.addItem(decoder.label, decoder.name)
+        self.decoder_input.currentIndexChanged.connect(self.set_decoder)
+        decoder_layout.addWidget(self.decoder_input)
+        decoder_layout.addStretch()
+        layout.addLayout(decoder_layout)
+
+        self.message_model = MessageListModel(buffer, self, channel_name, decode_pool)
+        self.message_model.on_decoded = self.notify_decoded
+        self.decoded.connect(self.apply_decoded)
+        self.message_list = self.create_message_view()
+        self.message_list.selectionModel().currentChanged.connect(self.show_message)
+
+        # Full text of the selected message
+        self.message_detail = QPlainTextEdit()
+        self.message_detail.setReadOnly(True)
+        self.message_detail.setFont(self.monospaced_font)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.message_list)
+        splitter.addWidget(self.message_detail)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter)
 
         self.export_button = QPushButton("Export")
         self.export_button.clicked.connect(self.export_content)
         layout.addWidget(self.export_button)
+        self.export_label = QLabel()
+        self.export_reported.connect(self.export_label.setText)
+        layout.addWidget(self.export_label)
 
-        # Load the monospaced font
-        font_id = QFontDatabase.addApplicationFont(
-            resource_path("assets/fonts/static/FiraCode-Regular.ttf")
-        )
-        font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
-        self.monospaced_font = QFont(font_family)
+        self.setLayout(layout)
+        self.setWindowFlags(Qt.WindowType.Tool)
 
+    def create_message_view(self):
+        delegate = MessageDelegate(self.monospaced_font, self)
+        message_list = QTableView()
+        message_list.setModel(self.message_model)
+        message_list.setItemDelegate(delegate)
+        message_list.setShowGrid(False)
+        message_list.setSelectionBehavior(QTableView.SelectRows)
+        message_list.setSelectionMode(QTableView.SingleSelection)
+        message_list.horizontalHeader().hide()
+        message_list.horizontalHeader().setStretchLastSection(True)
+        message_list.verticalHeader().hide()
+        message_list.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        message_list.verticalHeader().setDefaultSectionSize(delegate.row_height)
+        return message_list
 
-        self.setLayout(layout)
-        self.setWindowFlags(Qt.Tool)
+    def showEvent(self, event):
+        self.sync_messages()
+        super().showEvent(event)
+
+    def update_output(self):
+        if self.isVisible():
+            self.sync_messages()
+
+    def sync_messages(self):
+        scroll_bar = self.message_list.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        self.message_model.sync()
+        if at_bottom:
+            self.message_list.scrollToBottom()
 
-    def update_output(self, data: str):
-        self.message_counter += 1
-        # Create the message number string with bold tags
-        message_number = f"<b>{self.message_counter}:</b><br>"
-        # Format the data as code with monospaced font and line wrapping
-        formatted_data = f"""<span style='font-family: "{self.monospaced_font.family()}";
-            white-space: pre-wrap;'>{data}</span>
-        """
-        self.output_text.append(message_number + formatted_data)
+    def set_decoder(self):
+        self.message_model.set_decoder(self.decoder_input.currentData())
+        self.show_message(self.message_list.currentIndex(), None)
 
+    def show_message(self, current, previous):
+        payload = current.data(PAYLOAD_ROLE)
+        if payload is None:
+            self.detail_key = None
+            self.message_detail.clear()
+            return
+        decoder = self.message_model.decoder
+        self.detail_key = (self.channel_name, current.data(SEQ_ROLE), decoder, None)
+        text = self.decode_pool.request(self.detail_key, payload, decoder, self.notify_decoded)
+        self.message_detail.setPlainText("Decoding..." if text is None else text)
+
+    def notify_decoded(self, key):
+        try:
+            self.decoded.emit(key)
+        except RuntimeError:
+            pass  # The window was closed and deleted meanwhile
+
+    def apply_decoded(self, key):
+        channel_name, seq, decoder, preview_limit = key
+        if preview_limit is not None:
+            if decoder == self.message_model.decoder:
+                self.message_model.seq_decoded(seq)
+        elif key == self.detail_key:
+            text = self.decode_pool.cached(key)
+            if text is not None:
+                self.message_detail.setPlainText(text)
 
     def export_content(self):
-        options = QFileDialog.Options()
-        file_name, _ = QFileDialog.getSaveFileName(
-            self,
-            "Save File",
-            f"{self.channel_name}.txt",
-            "Text Files (*.txt);;All Files (*)",
-            options=options,
-        )
+        file_name = get_export_path(self, "Export Messages", f"{self.channel_name}.ndjson")
         if file_name:
-            with open(file_name, "w", encoding="utf-8") as file:
-                file.write(self.output_text.toPlainText())
+            try:
+                export_history(
+                    file_name, [(self.channel_name, self.buffer)], on_status=self.report_export
+                )
+            except RuntimeError as error:  # e.g. a .zst name without zstandard installed
+                self.export_label.setText(f"Cannot export to {file_name}: {error}")
+                return
+            self.export_label.setText(f"Exporting to {file_name}")
+
+    def report_export(self, status: str):
+        try:
+            self.export_reported.emit(status)
+        except RuntimeError:
+            pass  # The window was closed and deleted meanwhile
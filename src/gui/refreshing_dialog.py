@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QDialog
+
+
+REFRESH_INTERVAL = 1000  # Milliseconds between refreshes while the dialog is visible
+
+
+class RefreshingDialog(QDialog):
+    """A dialog that calls ``refresh`` when shown and then periodically until hidden."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def refresh(self):
+        raise NotImplementedError
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start(REFRESH_INTERVAL)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from PyQt5.QtCore import QTimer
+
+from core.instrumentation import CHANNEL_LIST, FRAME, OUTPUT_WINDOWS, SIGNAL, instruments
+
+if TYPE_CHECKING:
+    from .main_window import RedisMonitor
+
+
+DEFAULT_FPS = 30
+MAX_FRAME_MESSAGES = 20_000  # Messages taken from the ingest queue per frame
+
+
+class RenderScheduler:
+    """Decouples ingest from painting.
+
+    Each frame drains a bounded slice of the ingest queue, which only marks channels dirty;
+    the same pass then applies list moves, counters, highlights, output window appends and
+    the status text. When disabled, every wake-up drains and flushes immediately.
+    """
+
+    def __init__(self, main_widget: "RedisMonitor", fps: int = DEFAULT_FPS):
+        self.main_widget = main_widget
+        self.enabled = False
+        self._dirty: dict[str, int] = {}
+        self._timestamp = 0.0
+        self._status: str | None = None
+        self._flushing = False
+
+        self._timer = QTimer()
+        self._timer.timeout.connect(self.flush)
+        self.set_fps(fps)
+
+    @property
+    def fps(self) -> int:
+        return 1000 // self._timer.interval()
+
+    def set_fps(self, fps: int):
+        self._timer.setInterval(max(1000 // max(fps, 1), 1))
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+        self.main_widget.highlighter.external_clock = enabled
+        if not enabled:
+            self._timer.stop()
+            self.flush()
+
+    def mark_dirty(self, counts: dict[str, int], timestamp: float, status: str | None = None):
+        """Queue per-channel message counts; insertion order is the order of last arrival."""
+        dirty = self._dirty
+        for channel_name, count in counts.items():
+            dirty[channel_name] = dirty.pop(channel_name, 0) + count
+        self._timestamp = timestamp
+        if status is not None:
+            self._status = status
+        self._schedule()
+
+    def wake(self):
+        """New messages are waiting in the ingest queue."""
+        instruments.stop_mark(SIGNAL)
+        self._schedule()
+
+    def clear(self):
+        self._dirty.clear()
+        self._status = None
+
+    def flush(self):
+        started = instruments.start()
+        self._flushing = True
+        try:
+            limit = MAX_FRAME_MESSAGES if self.enabled else None
+            self.main_widget.channel_manager.drain_ingest_queue(limit)
+        finally:
+            self._flushing = False
+
+        dirty, self._dirty = self._dirty, {}
+        highlighter = self.main_widget.highlighter
+        backlog = len(self.main_widget.ingest_queue)
+        if not dirty and self._status is None and not highlighter.active and not backlog:
+            self._timer.stop()
+            return
+
+        channel_list = self.main_widget.channel_list
+        channel_list.setUpdatesEnabled(False)
+        try:
+            # A status from show_status is held; the monitoring text waits until it expires
+            if self._status is not None and time.monotonic() >= self.main_widget.status_held_until:
+                if self.main_widget.status_bar.currentMessage() != self._status:
+                    self.main_widget.status_bar.showMessage(self._status)
+                self._status = None
+
+            channel_manager = self.main_widget.channel_manager
+            if dirty:
+                stage_started = instruments.start()
+                channel_manager.update_channel_items(dirty, self._timestamp)
+                instruments.stop(CHANNEL_LIST, stage_started, len(dirty))
+                stage_started = instruments.start()
+                for channel_name in dirty:
+                    channel_manager.update_output_window(channel_name)
+                instruments.stop(OUTPUT_WINDOWS, stage_started, len(dirty))
+            if self.enabled:
+                highlighter.tick()
+        finally:
+            channel_list.setUpdatesEnabled(True)
+        if started:
+            instruments.stop(FRAME, started, sum(dirty.values()))
+
+    def _schedule(self):
+        if not self.enabled:
+            if not self._flushing:
+                self.flush()
+        elif not self._timer.isActive():
+            self._timer.start()
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QCheckBox,
+    QComboBox,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QSpinBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from core.decoding import preview_text
+from core.search import JSON_FIELD, REGEX, SUBSTRING, SearchQuery
+from core.messages import Message
+
+from .message_model import PREVIEW_BYTES
+
+if TYPE_CHECKING:
+    from .main_window import RedisMonitor
+
+
+SEARCH_MODES = [("Substring", SUBSTRING), ("Regex", REGEX), ("JSON Field", JSON_FIELD)]
+PLACEHOLDERS = {
+    SUBSTRING: "Text to find",
+    REGEX: r"Regular expression, e.g. user-\d+ (joined|left)",
+    JSON_FIELD: "Field path, optionally with a value, e.g. order.status=paid",
+}
+
+
+class SearchDialog(QDialog):
+    """Searches every captured message through the monitor's SearchIndex.
+
+    Each search runs on a thread of its own; starting another or closing the dialog cancels
+    the one in progress.
+    """
+
+    searched = pyqtSignal(object, object, float)  # Query, its results and seconds taken
+
+    def __init__(self, main_widget: "RedisMonitor"):
+        super().__init__()
+        self.main_widget = main_widget
+        self.query: Optional[SearchQuery] = None  # The search in progress
+        self.searched.connect(self.show_results)
+        self.setWindowTitle("Search Messages")
+        self.setMinimumSize(700, 400)
+        layout = QVBoxLayout()
+
+        query_layout = QHBoxLayout()
+        self.query_input = QLineEdit()
+        self.query_input.returnPressed.connect(self.run_search)
+        query_layout.addWidget(self.query_input)
+        self.mode_input = QComboBox()
+        for text, mode in SEARCH_MODES:
+            self.mode_input.addItem(text, mode)
+        self.mode_input.currentIndexChanged.connect(self.update_placeholder)
+        query_layout.addWidget(self.mode_input)
+        search_button = QPushButton("Search")
+        search_button.clicked.connect(self.run_search)
+        query_layout.addWidget(search_button)
+        layout.addLayout(query_layout)
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Channels:"))
+        self.channel_input = QLineEdit("*")
+        self.channel_input.returnPressed.connect(self.run_search)
+        filter_layout.addWidget(self.channel_input)
+        filter_layout.addWidget(QLabel("Received in the last"))
+        self.minutes_input = QSpinBox()
+        self.minutes_input.setRange(0, 7 * 24 * 60)
+        self.minutes_input.setSuffix(" min")
+        self.minutes_input.setSpecialValueText("any time")
+        filter_layout.addWidget(self.minutes_input)
+        self.case_input = QCheckBox("Match case")
+        filter_layout.addWidget(self.case_input)
+        layout.addLayout(filter_layout)
+
+        self.results = QTableWidget(0, 3)
+        self.results.setHorizontalHeaderLabels(["Time", "Channel", "Message"])
+        self.results.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.results.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        vertical_header = self.results.verticalHeader()
+        horizontal_header = self.results.horizontalHeader()
+        assert vertical_header is not None and horizontal_header is not None
+        vertical_header.hide()
+        horizontal_header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        horizontal_header.setStretchLastSection(True)
+        self.results.cellDoubleClicked.connect(self.open_result)
+        layout.addWidget(self.results)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.setLayout(layout)
+        self.setWindowFlags(Qt.WindowType.Tool)
+        self.update_placeholder()
+
+    def update_placeholder(self):
+        self.query_input.setPlaceholderText(PLACEHOLDERS[self.mode_input.currentData()])
+
+    def run_search(self):
+        minutes = self.minutes_input.value()
+        try:
+            query = SearchQuery(
+                self.query_input.text(),
+                mode=self.mode_input.currentData(),
+                channel_glob=self.channel_input.text().strip(),
+                since=time.time() - minutes * 60 if minutes else None,
+                case_sensitive=self.case_input.isChecked(),
+            )
+        except re.error as error:
+            self.status_label.setText(f"Invalid regular expression: {error}")
+            return
+
+        if self.query is not None:
+            self.query.cancel()
+        self.query = query
+        self.status_label.setText("Searching...")
+        threading.Thread(target=self.search, args=(query,), name="search", daemon=True).start()
+
+    def search(self, query: SearchQuery):
+        started = time.perf_counter()
+        results = self.main_widget.search_index.search(query)
+        self.searched.emit(query, results, time.perf_counter() - started)
+
+    def show_results(self, query: SearchQuery, results: list[Message], elapsed: float):
+        if query is not self.query:
+            return  # Replaced or cancelled while it ran
+        self.query = None
+        self.results.setRowCount(len(results))
+        for row, (channel_name, payload, timestamp) in enumerate(results):
+            received = time.strftime("%H:%M:%S", time.localtime(timestamp))
+            milliseconds = int(timestamp % 1 * 1000)
+            self.results.setItem(row, 0, QTableWidgetItem(f"{received}.{milliseconds:03d}"))
+            self.results.setItem(row, 1, QTableWidgetItem(channel_name))
+            self.results.setItem(row, 2, QTableWidgetItem(preview_text(payload, PREVIEW_BYTES)))
+
+        search_index = self.main_widget.search_index
+        status = (
+            f"{len(results)} results in {elapsed * 1000:.0f} ms, "
+            f"{search_index.document_count} messages indexed"
+        )
+        if len(results) >= query.limit:
+            status += f" (showing the newest {query.limit})"
+        if search_index.skipped:
+            status += f", {search_index.skipped} skipped while the indexer was behind"
+        self.status_label.setText(status)
+
+    def hideEvent(self, event):
+        if self.query is not None:
+            self.query.cancel()
+            self.query = None
+            self.status_label.setText("Search cancelled")
+        super().hideEvent(event)
+
+    def open_result(self, row: int, column: int):
+        item = self.results.item(row, 1)
+        if item is not None:
+            self.main_widget.window_manager.open_output_window(item.text())
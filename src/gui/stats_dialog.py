@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import TYPE_CHECKING
+
+from PyQt5.QtCore import QPointF, Qt
+from PyQt5.QtGui import QPainter, QPen, QPolygonF
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QGridLayout,
+    QHeaderView,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QTabWidget,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.decoding import decode_text
+from core.events import PUBSUB
+from core.stats import MAX_NUMSUB_CHANNELS, SERIES
+
+from .channel_model import format_count
+from .refreshing_dialog import RefreshingDialog
+
+if TYPE_CHECKING:
+    from .main_window import RedisMonitor
+
+
+BYTE_SERIES = {"used_memory", "pubsub_output_buffer", "max_output_buffer"}
+
+
+class Sparkline(QWidget):
+    """A minimal line chart of one series, scaled to its own range."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.values: list[float] = []
+        self.setMinimumSize(160, 28)
+
+    def set_values(self, values: list[float]):
+        self.values = values
+        self.update()
+
+    def paintEvent(self, event):
+        # NaN marks a missed sample and is the only value unequal to itself
+        points = [(index, value) for index, value in enumerate(self.values) if value == value]
+        if len(points) < 2:
+            return
+        low = min(value for _, value in points)
+        high = max(value for _, value in points)
+        span = high - low or 1.0
+        width = self.width() - 2
+        height = self.height() - 2
+        last = len(self.values) - 1 or 1
+        polygon = QPolygonF(
+            [
+                QPointF(1 + width * index / last, 1 + height * (1 - (value - low) / span))
+                for index, value in points
+            ]
+        )
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.palette().highlight().color(), 1.5))
+        painter.drawPolyline(polygon)
+
+
+class StatsDialog(RefreshingDialog):
+    """Server statistics from the monitor's StatsPoller, next to what the monitor receives."""
+
+    def __init__(self, main_widget: "RedisMonitor"):
+        super().__init__()
+        self.main_widget = main_widget
+        self.setWindowTitle("Server Stats")
+        self.setMinimumSize(720, 560)
+        layout = QVBoxLayout()
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        grid = QGridLayout()
+        self.value_labels: dict[str, QLabel] = {}
+        self.sparklines: dict[str, Sparkline] = {}
+        for row, (name, (_, label)) in enumerate(SERIES.items()):
+            grid.addWidget(QLabel(label), row, 0)
+            value_label = QLabel("-")
+            value_label.setAlignment(
+                Qt.Alignment(Qt.AlignmentFlag.AlignRight) | Qt.AlignmentFlag.AlignVCenter
+            )
+            value_label.setMinimumWidth(80)
+            grid.addWidget(value_label, row, 1)
+            sparkline = Sparkline()
+            grid.addWidget(sparkline, row, 2)
+            self.value_labels[name] = value_label
+            self.sparklines[name] = sparkline
+        grid.setColumnStretch(2, 1)
+        layout.addLayout(grid)
+
+        tabs = QTabWidget()
+        self.subscribers_table = self.create_table(["Channel", "Subscribers", "Monitor msg/s"])
+        tabs.addTab(self.subscribers_table, "Subscribers")
+        self.clients_table = self.create_table(
+            ["Client", "Name", "Output buffer", "Subscriptions", "Last command"]
+        )
+        tabs.addTab(self.clients_table, "Output Buffers")
+        self.slowlog_table = self.create_table(["ID", "Started", "Duration", "Command"])
+        tabs.addTab(self.slowlog_table, "Slow Log")
+        layout.addWidget(tabs)
+
+        self.setLayout(layout)
+        self.setWindowFlags(Qt.WindowType.Tool)
+
+    def create_table(self, headers: list[str]) -> QTableWidget:
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        vertical_header = table.verticalHeader()
+        horizontal_header = table.horizontalHeader()
+        assert vertical_header is not None and horizontal_header is not None
+        vertical_header.hide()
+        horizontal_header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        horizontal_header.setStretchLastSection(True)
+        return table
+
+    def refresh(self):
+        poller = self.main_widget.stats_poller
+        if poller is None:
+            self.status_label.setText(
+                "Not polling: start monitoring a Redis server with Settings > Poll Server "
+                "Stats enabled"
+            )
+            return
+
+        if self.main_widget.ingest_mode == PUBSUB:
+            # Subscriber counts for the channels at the top of the channel list
+            channel_model = self.main_widget.channel_model
+            rows = min(channel_model.rowCount(), MAX_NUMSUB_CHANNELS)
+            poller.channels = [
+                channel_model.channel_name(channel_model.index(row, 0)) for row in range(rows)
+            ]
+
+        history = poller.history
+        self.status_label.setText(
+            f"Polling {poller.redis_url} every {poller.interval:g}s, {history.count} samples"
+            + (f"; last poll failed: {poller.error}" if poller.error else "")
+        )
+        for name, value_label in self.value_labels.items():
+            value_label.setText(format_value(name, history.latest(name)))
+            self.sparklines[name].set_values(history.values(name))
+
+        now = time.time()
+        channel_metrics = self.main_widget.channel_metrics
+        self.fill_table(
+            self.subscribers_table,
+            [
+                [channel, str(count), format_count(channel_metrics.rates(channel, now)[0])]
+                for channel, count in poller.subscribers
+            ],
+        )
+        self.fill_table(
+            self.clients_table,
+            [
+                [
+                    client.get("addr", ""),
+                    client.get("name", ""),
+                    format_count(int(client.get("omem", 0))) + "B",
+                    f"{client.get('sub', 0)} / {client.get('psub', 0)}",
+                    client.get("cmd", ""),
+                ]
+                for client in poller.clients
+            ],
+        )
+        self.fill_table(
+            self.slowlog_table,
+            [
+                [
+                    str(entry["id"]),
+                    time.strftime("%H:%M:%S", time.localtime(entry["start_time"])),
+                    f"{entry['duration'] / 1000:.1f} ms",
+                    decode_text(entry["command"]),
+                ]
+                for entry in poller.slowlog
+            ],
+        )
+
+    def fill_table(self, table: QTableWidget, rows: list[list[str]]):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(value))
+
+
+def format_value(name: str, value: float) -> str:
+    if math.isnan(value):
+        return "-"
+    if name in BYTE_SERIES:
+        return format_count(value) + "B"
+    if value < 1000 and value == int(value):
+        return str(int(value))
+    return format_count(value)
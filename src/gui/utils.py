@@ -1,6 +1,10 @@
 import sys
 import os
 
+from PyQt5.QtWidgets import QFileDialog
+
+from core.export import zstd_available
+
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -13,6 +17,15 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+def get_export_path(parent, title: str, default_name: str) -> str:
+    """Ask for an NDJSON file name; the chosen suffix selects the compression."""
+    filters = ["NDJSON (*.ndjson)", "Gzip NDJSON (*.ndjson.gz)"]
+    if zstd_available():
+        filters.append("Zstandard NDJSON (*.ndjson.zst)")
+    file_name, _ = QFileDialog.getSaveFileName(parent, title, default_name, ";;".join(filters))
+    return file_name
+
+
 START_STYLESHEET = """
                 QPushButton {
                     border-radius: 25;
@@ -1,33 +1,119 @@
-import redis
-from redis.exceptions import (
-    ConnectionError as RedisConnectionError,
-    TimeoutError as RedisTimeoutError,
-)
+from typing import Optional
 
 from PyQt5.QtCore import QThread, pyqtSignal
 
+from core import ChannelMetrics, FilterEngine, IngestQueue, Message
+from core.events import DEFAULT_SAMPLE_RATE, PUBSUB, EventCounters, create_event_subscriber
+from core.export import NdjsonWriter
+from core.instrumentation import INGEST, SIGNAL, instruments
+from core.messages import BATCH_INTERVAL, BATCH_SIZE, split_list
+from core.search import SearchIndex
+
+
+STOP_TIMEOUT = 2000  # Milliseconds to wait for the thread after asking it to stop
+
 
 class RedisSubscriber(QThread):
     new_channel = pyqtSignal(str, str, str)  # Emit both channel name and data
+    messages_ready = pyqtSignal()  # Emitted when the ingest queue stops being empty
 
-
-    def __init__(self, redis_url, channel_pattern):
+    def __init__(
+        self,
+        redis_url,
+        channel_pattern,
+        ingest_queue: IngestQueue,
+        channel_metrics: ChannelMetrics,
+        search_index: SearchIndex,
+        filter_engine: FilterEngine,
+        event_counters: EventCounters,
+        ingest_mode: str = PUBSUB,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        batch_interval: float = BATCH_INTERVAL,
+        batch_size: int = BATCH_SIZE,
+    ):
         super().__init__()
         self.redis_url = redis_url
         self.channel_pattern = channel_pattern
+        self.ingest_queue = ingest_queue
+        self.channel_metrics = channel_metrics
+        self.search_index = search_index
+        self.filter_engine = filter_engine
+        self.recorder: Optional[NdjsonWriter] = None  # Swapped from the GUI thread
+        self.received = 0  # Messages received from the server, before filtering
+        self.detached = False  # Set once stop gives up waiting; later batches are dropped
+        redis_urls = split_list(redis_url)
+        if not redis_urls:
+            raise ValueError("No Redis URL given")
+        if ingest_mode == PUBSUB:
+            # Imported on the first start, as it brings in redis
+            from core.subscriber import create_subscriber
+
+            self.event_counters = None
+            # Several comma-separated URLs or patterns switch to the asyncio engine
+            self.subscriber = create_subscriber(
+                redis_urls,
+                split_list(channel_pattern),
+                batch_interval=batch_interval,
+                batch_size=batch_size,
+                on_status=self.emit_status,
+            )
+        else:
+            # Keyspace and MONITOR events come from one server; the pattern matches keys
+            self.event_counters = event_counters
+            self.subscriber = create_event_subscriber(
+                ingest_mode,
+                redis_urls[0],
+                channel_pattern.strip() or "*",
+                sample_rate,
+                batch_interval=batch_interval,
+                batch_size=batch_size,
+                on_status=self.emit_status,
+            )
+
+    def emit_status(self, status: str):
+        self.new_channel.emit("", "", status)
+
+    def enqueue(self, batch: list[Message]):
+        if self.detached:
+            return
+        started = instruments.start()
+        self.received += len(batch)
+        # Filtered-out messages stop here, before any bookkeeping or Qt signal
+        batch = self.filter_engine.apply(batch)
+        if not batch:
+            instruments.stop(INGEST, started, 0)
+            return
+        if self.event_counters is not None:
+            self.event_counters.add_batch(batch, self.subscriber.sample_rate)
+        # Metrics see every message, including those the overload policy drops
+        self.channel_metrics.add_batch(batch)
+        self.search_index.add_batch(batch)
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.write(batch)
+        # One wake-up per empty-to-non-empty transition keeps Qt's event queue bounded
+        if self.ingest_queue.put(batch):
+            instruments.mark(SIGNAL)
+            self.messages_ready.emit()
+        instruments.stop(INGEST, started, len(batch))
 
     def run(self):
-        while True:
-            try:
-                r = redis.Redis.from_url(self.redis_url)
-                pubsub = r.pubsub()
-                pubsub.psubscribe(self.channel_pattern)
-                for message in pubsub.listen():
-                    if message["type"] == "pmessage":
-                        channel = message["channel"].decode("utf-8")
-                        data = message["data"].decode("utf-8")
-                        self.new_channel.emit(channel, data, "success")
-            except (RedisTimeoutError, RedisConnectionError):
-                print("wait for connection")
-                self.new_channel.emit("", "", "Wait For Connection ...")
+        self.subscriber.run(self.enqueue)
 
+    def stop(self, timeout: int = STOP_TIMEOUT) -> bool:
+        """Ask the subscriber to unsubscribe and wait up to ``timeout`` ms for the thread.
+
+        A thread still running after that is detached: its signals are disconnected and
+        whatever it still receives is dropped, so it cannot feed a newer subscriber's queue.
+        """
+        self.subscriber.stop()
+        if self.wait(timeout):
+            return True
+        self.detached = True
+        self.recorder = None
+        for signal in (self.new_channel, self.messages_ready):
+            try:
+                signal.disconnect()
+            except TypeError:
+                pass  # Nothing connected
+        return False